@@ -0,0 +1,158 @@
+"""
+app_styles.py
+Hoja de estilo (QSS) de la ventana principal y el login - Windows 11 Style
+Se aplica una sola vez con app.setStyleSheet(); cada control se selecciona
+por su objectName en lugar de recibir un setStyleSheet propio.
+"""
+
+LOGIN_QSS = """
+    QWidget#erpLoginCard {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+            stop:0 #FFFFFF, stop:1 #F8FAFC);
+        border-radius: 12px;
+        border: 1px solid #E2E8F0;
+    }
+    QLineEdit#erpLoginField {
+        background: #FFFFFF;
+        border: 1.5px solid #E2E8F0;
+        border-radius: 8px;
+        padding: 8px 12px;
+        font-size: 14px;
+        color: #1E293B;
+    }
+    QLineEdit#erpLoginField:focus {
+        border-color: #3B82F6;
+        background: #F8FAFF;
+    }
+    AnimatedButton#erpLoginCancelBtn {
+        background: transparent;
+        border: 1.5px solid #E2E8F0;
+        border-radius: 8px;
+        color: #64748B;
+        font-weight: 600;
+        font-size: 14px;
+    }
+    AnimatedButton#erpLoginCancelBtn:hover {
+        background: #F1F5F9;
+        border-color: #CBD5E1;
+    }
+    AnimatedButton#erpLoginBtn {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #2563EB, stop:1 #3B82F6);
+        border: none;
+        border-radius: 8px;
+        color: white;
+        font-weight: 600;
+        font-size: 14px;
+    }
+    AnimatedButton#erpLoginBtn:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #1D4ED8, stop:1 #2563EB);
+    }
+"""
+
+# Fondo de la ventana: se hereda por todos los descendientes; el área de
+# contenido lo deja transparente para que cada frame pinte el suyo
+WINDOW_QSS = """
+    QWidget#erpCentral, QWidget#erpCentral * {
+        background: #F8FAFC;
+    }
+    QFrame#erpContent, QFrame#erpContent * {
+        background: transparent;
+    }
+    QStackedWidget#erpStack {
+        background: transparent;
+        border-radius: 12px;
+    }
+    QFrame#erpHeader {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #FFFFFF, stop:1 #F8FAFC);
+        border-bottom: 1px solid #E2E8F0;
+    }
+    AnimatedButton#erpWinCtrlBtn {
+        background: transparent;
+        border: 1px solid #E2E8F0;
+        border-radius: 6px;
+        color: #64748B;
+        font-weight: bold;
+    }
+    AnimatedButton#erpWinCtrlBtn:hover {
+        background: #F1F5F9;
+    }
+    AnimatedButton#erpWinCloseBtn {
+        background: transparent;
+        border: 1px solid #FECACA;
+        border-radius: 6px;
+        color: #DC2626;
+        font-weight: bold;
+    }
+    AnimatedButton#erpWinCloseBtn:hover {
+        background: #FEF2F2;
+    }
+    AnimatedButton#erpNotifOpenBtn {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #3B82F6, stop:1 #60A5FA);
+        border: none;
+        border-radius: 8px;
+        color: white;
+        font-weight: 600;
+        font-size: 14px;
+        padding: 0 24px;
+    }
+    AnimatedButton#erpNotifOpenBtn:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #2563EB, stop:1 #3B82F6);
+    }
+"""
+
+SIDEBAR_QSS = """
+    QFrame#erpSidebar {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #F8FAFC, stop:1 #FFFFFF);
+        border-right: 1px solid #E2E8F0;
+    }
+    AnimatedButton#erpSidebarNavBtn {
+        background: transparent;
+        border: none;
+        text-align: left;
+        padding: 10px 16px;
+        font-family: 'Segoe UI';
+        font-size: 14px;
+        color: #475569;
+        border-radius: 8px;
+        margin: 2px 0;
+    }
+    AnimatedButton#erpSidebarNavBtn:hover {
+        background: #F1F5F9;
+        color: #1E293B;
+    }
+    AnimatedButton#erpSidebarNavBtn:checked {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #3B82F6, stop:1 #60A5FA);
+        color: white;
+        font-weight: 600;
+    }
+    QFrame#erpUserCard {
+        background: #F8FAFC;
+        border-radius: 8px;
+        border: 1px solid #E2E8F0;
+        padding: 12px;
+    }
+    AnimatedButton#erpLogoutBtn {
+        background: transparent;
+        border: 1px solid #FECACA;
+        border-radius: 6px;
+        color: #DC2626;
+        font-size: 12px;
+        font-weight: 500;
+    }
+    AnimatedButton#erpLogoutBtn:hover {
+        background: #FEF2F2;
+    }
+"""
+
+APP_QSS = "".join((
+    LOGIN_QSS,
+    WINDOW_QSS,
+    SIDEBAR_QSS,
+))
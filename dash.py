@@ -2,10 +2,34 @@ import sys
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout,
     QHBoxLayout, QGridLayout, QLabel, QPushButton,
-    QSpacerItem, QSizePolicy, QComboBox
+    QComboBox, QScrollArea, QFrame
 )
-from PySide6.QtGui import QFont, QFontDatabase
-from PySide6.QtCore import Qt
+from PySide6.QtGui import QFont, QFontDatabase, QPixmap, QPainter, QColor
+from PySide6.QtCore import Qt, QTimer, QRect, QPoint, QEvent
+
+# Fuente base de los iconos (QFont es un handle implícitamente compartido)
+_KPI_ICON_FONT = QFont("Arial", 14, QFont.Weight.Bold)
+
+# Glifos ya rasterizados, por (glifo, tamaño en px, color)
+_ICON_PIXMAP_CACHE = {}
+
+
+def _icon_pixmap(glyph, px, color="#ffffff"):
+    """Devuelve el glifo pintado una sola vez en un QPixmap de px x px."""
+    key = (glyph, px, color)
+    pixmap = _ICON_PIXMAP_CACHE.get(key)
+    if pixmap is None:
+        pixmap = QPixmap(px, px)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        font = QFont(_KPI_ICON_FONT)
+        font.setPixelSize(int(px * 0.65))
+        painter = QPainter(pixmap)
+        painter.setFont(font)
+        painter.setPen(QColor(color))
+        painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, glyph)
+        painter.end()
+        _ICON_PIXMAP_CACHE[key] = pixmap
+    return pixmap
 
 # --- 1. Hoja de Estilo (QSS) para un Look Profesional y Claro (Material Design) ---
 # Define un tema claro con acentos de púrpura/índigo, siguiendo el estilo de la imagen.
@@ -88,6 +112,12 @@ LIGHT_QSS = """
         color: #4caf50; /* Color de cambio positivo (verde) */
     }
 
+    /* Círculo del icono de cada KPI, seleccionado por la propiedad kpiIcon */
+    QLabel[kpiIcon="purple"] { background-color: #673ab7; border-radius: 15px; color: white; }
+    QLabel[kpiIcon="amber"] { background-color: #ffc107; border-radius: 15px; color: white; }
+    QLabel[kpiIcon="red"] { background-color: #f44336; border-radius: 15px; color: white; }
+    QLabel[kpiIcon="cyan"] { background-color: #00bcd4; border-radius: 15px; color: white; }
+
     /* Placeholder de Título de Dashboard */
     #dashboardTitle {
         font-size: 24pt;
@@ -115,15 +145,12 @@ LIGHT_QSS = """
 
 # --- 2. Componente: Tarjeta de Indicador Clave de Rendimiento (KPI) ---
 class KPICard(QWidget):
-    def __init__(self, title, value, change, icon_color, icon_text, parent=None):
+    def __init__(self, title, value, change, icon_key, icon_text, parent=None):
         super().__init__(parent)
-        self.setObjectName("KPICard")
-        
-        # Envuelve el contenido en un QWidget con el estilo Card
-        self.container = QWidget()
-        self.container.setObjectName("Card")
-        
-        layout = QVBoxLayout(self.container)
+        # La propia tarjeta recibe el estilo Card: un único layout, sin contenedor intermedio
+        self.setObjectName("Card")
+
+        layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(5)
 
@@ -138,11 +165,11 @@ class KPICard(QWidget):
         top_row.addStretch()
         
         # Icono (Círculo de color)
-        icon_circle = QLabel(icon_text)
-        icon_circle.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+        icon_circle = QLabel()
+        icon_circle.setPixmap(_icon_pixmap(icon_text, 30))
         icon_circle.setAlignment(Qt.AlignmentFlag.AlignCenter)
         icon_circle.setFixedSize(30, 30)
-        icon_circle.setStyleSheet(f"background-color: {icon_color}; border-radius: 15px; color: white;")
+        icon_circle.setProperty("kpiIcon", icon_key)
         top_row.addWidget(icon_circle)
 
         layout.addLayout(top_row)
@@ -156,19 +183,30 @@ class KPICard(QWidget):
         change_label = QLabel(change)
         change_label.setObjectName("kpiChange")
         layout.addWidget(change_label)
-        
-        # Layout principal del KPICard para que el contenedor ocupe todo el espacio
-        main_layout = QVBoxLayout(self)
-        main_layout.addWidget(self.container)
-        main_layout.setContentsMargins(0, 0, 0, 0)
 
 
 # --- 3. Componente: Sidebar de Navegación ---
 class Sidebar(QWidget):
+    # Grupos de navegación: (título, ((texto, activo), ...))
+    NAV_GROUPS = (
+        ("INTERFACE", (("Overview", False), ("Dashboards", True),
+                       ("Analytics", False), ("Accounting", False))),
+        ("NEGOCIO", (("Orders", False), ("Projects", False),
+                     ("Layouts", False), ("Pages", False))),
+        ("UI TOOLKIT", (("Components", False), ("Content", False),
+                        ("Forms", False), ("Utilities", False))),
+    )
+    # event() puede recibir eventos antes de que __init__ cree la lista
+    _pending_checks = ()
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Toda la construcción sin repintados intermedios
+        self.setUpdatesEnabled(False)
         self.setObjectName("Sidebar")
         self.setFixedWidth(220)
+        # Botones a marcar cuando el sidebar se pula por primera vez
+        self._pending_checks = []
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -179,34 +217,27 @@ class Sidebar(QWidget):
         logo.setObjectName("AppHeader")
         layout.addWidget(logo)
 
-        # --- Grupo INTERFACE ---
-        layout.addWidget(self._create_group_title("INTERFACE"))
-        self._create_nav_button(layout, "Overview", False)
-        self._create_nav_button(layout, "Dashboards", True)
-        self._create_nav_button(layout, "Analytics", False)
-        self._create_nav_button(layout, "Accounting", False)
-        
-        # --- Grupo NEGOCIO ---
-        layout.addWidget(self._create_group_title("NEGOCIO"))
-        self._create_nav_button(layout, "Orders", False)
-        self._create_nav_button(layout, "Projects", False)
-        self._create_nav_button(layout, "Layouts", False)
-        self._create_nav_button(layout, "Pages", False)
-
-        # --- Grupo UI TOOLKIT ---
-        layout.addWidget(self._create_group_title("UI TOOLKIT"))
-        self._create_nav_button(layout, "Components", False)
-        self._create_nav_button(layout, "Content", False)
-        self._create_nav_button(layout, "Forms", False)
-        self._create_nav_button(layout, "Utilities", False)
+        # Grupos y botones de navegación
+        for group, items in self.NAV_GROUPS:
+            layout.addWidget(self._create_group_title(group))
+            for text, is_checked in items:
+                self._create_nav_button(layout, text, is_checked)
 
         # Espaciador
-        layout.addItem(QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
+        layout.addStretch(1)
 
         # Usuario Actual (Mockup)
         user_info = QLabel("Logged in as\nSmart Business App")
         user_info.setStyleSheet("font-size: 9pt; color: #757575; padding: 10px 20px;")
         layout.addWidget(user_info)
+        self.setUpdatesEnabled(True)
+
+    def event(self, event):
+        if event.type() == QEvent.Type.Polish and self._pending_checks:
+            for btn in self._pending_checks:
+                btn.setChecked(True)
+            self._pending_checks.clear()
+        return super().event(event)
 
     def _create_group_title(self, text):
         title = QLabel(text)
@@ -216,60 +247,124 @@ class Sidebar(QWidget):
     def _create_nav_button(self, layout, text, is_checked=False):
         btn = QPushButton(text)
         btn.setCheckable(True)
-        btn.setChecked(is_checked)
+        if is_checked:
+            self._pending_checks.append(btn)
         layout.addWidget(btn)
 
 # --- 4. Componente: Vista Principal del Dashboard ---
 class DashboardView(QWidget):
+    # Colores de acento tomados de la imagen: Púrpura, Amarillo, Rojo, Turquesa
+    # (título, valor, cambio, color del icono, icono)
+    KPI_DATA = (
+        ("Downloads", "101.1K", "↓ 5% last month", "purple", "⬇"),
+        ("Purchases", "12.2K", "↑ 2% last month", "amber", "⬆"),
+        ("Customers", "5.3K", "↑ 7% last month", "red", "👤"),
+        ("Channels", "7", "↑ 0.4% last month", "cyan", "⚙️"),
+    )
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        layout = QVBoxLayout(self)
+        # El contenido va dentro de un QScrollArea: las filas inferiores
+        # solo se construyen cuando el viewport llega a mostrarlas
+        outer_layout = QVBoxLayout(self)
+        outer_layout.setContentsMargins(0, 0, 0, 0)
+        self._scroll = QScrollArea()
+        self._scroll.setWidgetResizable(True)
+        self._scroll.setFrameShape(QFrame.Shape.NoFrame)
+        outer_layout.addWidget(self._scroll)
+
+        content = QWidget()
+        self._scroll.setWidget(content)
+        layout = QVBoxLayout(content)
+        self._content_layout = layout
         layout.setContentsMargins(30, 20, 30, 30)
         layout.setSpacing(20)
 
         # 1. Título y Filtros
         header_layout = QHBoxLayout()
         
-        title = QLabel("Dashboard")
+        # Título y subtítulo en un único QLabel de texto enriquecido
+        title = QLabel(
+            '<div style="font-size:24pt; color:#333333;">Dashboard</div>'
+            '<div style="font-size:10pt; color:#757575;">Sales overview &amp; summary</div>'
+        )
         title.setObjectName("dashboardTitle")
-        subtitle = QLabel("Sales overview & summary")
-        subtitle.setStyleSheet("font-size: 10pt; color: #757575;")
-        
-        # Contenedor para Título y Subtítulo
-        title_container = QVBoxLayout()
-        title_container.addWidget(title)
-        title_container.addWidget(subtitle)
-        title_container.setSpacing(0)
-        
-        header_layout.addLayout(title_container)
+        title.setTextFormat(Qt.TextFormat.RichText)
+        header_layout.addWidget(title)
         header_layout.addStretch()
 
         # Filtros (Mockup)
         header_layout.addWidget(QLabel("View by:"))
         view_combo = QComboBox()
-        view_combo.addItems(["Order type", "Product type"])
         header_layout.addWidget(view_combo)
         
         header_layout.addWidget(QLabel("Sale from:"))
         sale_combo = QComboBox()
-        sale_combo.addItems(["Last year", "This year"])
         header_layout.addWidget(sale_combo)
 
+        # Carga en bloque, sin señales ni repintado de la vista desplegable
+        for combo, items in ((view_combo, ["Order type", "Product type"]),
+                             (sale_combo, ["Last year", "This year"])):
+            combo.blockSignals(True)
+            combo.view().setUpdatesEnabled(False)
+            combo.addItems(items)
+            combo.view().setUpdatesEnabled(True)
+            combo.blockSignals(False)
+
         layout.addLayout(header_layout)
 
         # 2. Fila de Indicadores Clave (KPIs)
         kpi_layout = QHBoxLayout()
-        
-        # Colores de acento tomados de la imagen: Púrpura, Amarillo, Rojo, Turquesa
-        kpi_layout.addWidget(KPICard("Downloads", "101.1K", "↓ 5% last month", "#673ab7", "⬇"))
-        kpi_layout.addWidget(KPICard("Purchases", "12.2K", "↑ 2% last month", "#ffc107", "⬆"))
-        kpi_layout.addWidget(KPICard("Customers", "5.3K", "↑ 7% last month", "#f44336", "👤"))
-        kpi_layout.addWidget(KPICard("Channels", "7", "↑ 0.4% last month", "#00bcd4", "⚙️"))
-        
+        self.setUpdatesEnabled(False)
+        for kpi in self.KPI_DATA:
+            kpi_layout.addWidget(KPICard(*kpi))
+        self.setUpdatesEnabled(True)
+
         layout.addLayout(kpi_layout)
 
+        # 3 y 4. Gráficos e información: marcadores hasta que sean visibles
+        self._lazy_rows = []
+        for builder, min_height in ((self._build_chart_row, 420), (self._build_info_row, 120)):
+            placeholder = QWidget()
+            placeholder.setMinimumHeight(min_height)
+            layout.addWidget(placeholder)
+            self._lazy_rows.append((placeholder, builder))
+        layout.addStretch(1) # Empuja todo hacia arriba
+
+        self._scroll.verticalScrollBar().valueChanged.connect(self._materialize_visible_rows)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # La geometría definitiva se conoce tras el primer ciclo de layout
+        QTimer.singleShot(0, self._materialize_visible_rows)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._lazy_rows:
+            QTimer.singleShot(0, self._materialize_visible_rows)
+
+    def _materialize_visible_rows(self, *_):
+        """Sustituye los marcadores que ya intersectan el viewport por su fila real."""
+        if not self._lazy_rows:
+            return
+        viewport = self._scroll.viewport()
+        visible = viewport.rect()
+        pending = []
+        for placeholder, builder in self._lazy_rows:
+            area = QRect(placeholder.mapTo(viewport, QPoint(0, 0)), placeholder.size())
+            if visible.intersects(area):
+                self._content_layout.replaceWidget(placeholder, builder())
+                placeholder.hide()
+                placeholder.deleteLater()
+            else:
+                pending.append((placeholder, builder))
+        self._lazy_rows = pending
+
+    def _build_chart_row(self):
         # 3. Fila de Gráficos (Revenue Breakdown y Segments)
-        chart_grid = QGridLayout()
+        row = QWidget()
+        chart_grid = QGridLayout(row)
+        chart_grid.setContentsMargins(0, 0, 0, 0)
         chart_grid.setHorizontalSpacing(25)
         
         # Revenue Breakdown (Gráfico de Barras Mockup)
@@ -279,7 +374,7 @@ class DashboardView(QWidget):
         
         revenue_card_layout.addWidget(QLabel("Revenue Breakdown"), 0, Qt.AlignmentFlag.AlignTop)
         revenue_card_layout.addWidget(QLabel("Compared to previous year"), 0, Qt.AlignmentFlag.AlignTop)
-        revenue_card_layout.addItem(QSpacerItem(20, 10, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed))
+        revenue_card_layout.addSpacing(10)
         
         # Mockup de Contenido de Gráfico
         graph_mockup = QLabel("$$$$ 59,402\n$ 50,000 Target\n119% YTD\n\nGRÁFICO DE BARRAS\n(Simulación de PySide6 QChart)")
@@ -297,7 +392,7 @@ class DashboardView(QWidget):
         
         segments_card_layout.addWidget(QLabel("Segments"), 0, Qt.AlignmentFlag.AlignTop)
         segments_card_layout.addWidget(QLabel("Revenue sources"), 0, Qt.AlignmentFlag.AlignTop)
-        segments_card_layout.addItem(QSpacerItem(20, 10, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed))
+        segments_card_layout.addSpacing(10)
         
         # Mockup de Contenido de Gráfico
         pie_mockup = QLabel("GRÁFICO CIRCULAR\n(Simulación de PySide6 QChart)")
@@ -310,19 +405,21 @@ class DashboardView(QWidget):
 
         chart_grid.setColumnStretch(0, 2) # Revenue Breakdown más grande
         chart_grid.setColumnStretch(1, 1) # Segments más pequeño
+        return row
 
-        layout.addLayout(chart_grid)
-
+    def _build_info_row(self):
         # 4. Fila de Tarjetas de Información
-        bottom_row = QHBoxLayout()
+        row = QWidget()
+        bottom_row = QHBoxLayout(row)
+        bottom_row.setContentsMargins(0, 0, 0, 0)
 
         # Privacy Suggestions (Tarjeta de Información 1)
         privacy_card = QWidget()
         privacy_card.setObjectName("Card")
         privacy_layout = QHBoxLayout(privacy_card)
         privacy_layout.addWidget(QLabel("Privacy Suggestions\nTake our privacy checklist to choose which settings are right for you."))
-        icon_label = QLabel("🔒")
-        icon_label.setFont(QFont("Arial", 30))
+        icon_label = QLabel()
+        icon_label.setPixmap(_icon_pixmap("🔒", 60, "#333333"))
         privacy_layout.addWidget(icon_label, 0, Qt.AlignmentFlag.AlignRight)
         bottom_row.addWidget(privacy_card, 1)
 
@@ -331,13 +428,11 @@ class DashboardView(QWidget):
         storage_card.setObjectName("Card")
         storage_layout = QHBoxLayout(storage_card)
         storage_layout.addWidget(QLabel("Account Storage\nYour account storage is shared across all devices\n18 GB of 30 GB used"))
-        icon_label = QLabel("☁️")
-        icon_label.setFont(QFont("Arial", 30))
+        icon_label = QLabel()
+        icon_label.setPixmap(_icon_pixmap("☁️", 60, "#333333"))
         storage_layout.addWidget(icon_label, 0, Qt.AlignmentFlag.AlignRight)
         bottom_row.addWidget(storage_card, 1)
-
-        layout.addLayout(bottom_row)
-        layout.addItem(QSpacerItem(20, 0, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)) # Empuja todo hacia arriba
+        return row
 
     def _create_activity_item(self, text):
         # Esta función ya no se usa, pero la mantengo como placeholder si fuera necesaria
@@ -357,9 +452,6 @@ class ERPWindow(QMainWindow):
         self.setWindowTitle("ERP Avanzado | Panel Material Design")
         self.setGeometry(100, 100, 1400, 900) # Tamaño considerable
 
-        # Aplicar Hoja de Estilo Global
-        self.setStyleSheet(LIGHT_QSS)
-
         # Contenedor Central
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -386,7 +478,9 @@ class ERPWindow(QMainWindow):
 if __name__ == "__main__":
     # La aplicación de PySide6 necesita cargarse antes de crear la ventana
     app = QApplication(sys.argv)
-    
+    # Hoja de estilo global: Qt la analiza una sola vez antes de crear widgets
+    app.setStyleSheet(LIGHT_QSS)
+
     # El uso de QFontDatabase se deja comentado ya que puede fallar sin el recurso de fuente adecuado.
     # Usamos emojis y estilos para simular los iconos.
     # try:
@@ -4,353 +4,561 @@ Maneja todas las operaciones CRUD y estructura de la base de datos completa
 """
 
 import sqlite3
+import hashlib
+import hmac
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 import json
 
+logger = logging.getLogger(__name__)
 
-class DBManager:
-    """Maneja la conexión a SQLite y operaciones CRUD/Setup."""
-
-    def __init__(self, db_name="erp_profesional.db"):
-        self.conn = sqlite3.connect(db_name)
-        self.cursor = self.conn.cursor()
-        self.create_tables()
-        self.insert_initial_data()
-
-    def create_tables(self):
-        """Crea todas las tablas necesarias del sistema."""
-
-        # Tabla de Configuración del Sistema
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Configuracion (
-                clave TEXT PRIMARY KEY,
-                valor TEXT,
-                descripcion TEXT,
-                categoria TEXT,
-                fecha_actualizacion DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Tabla de Usuarios
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Usuarios (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nombre TEXT NOT NULL,
-                usuario TEXT UNIQUE NOT NULL,
-                contrasena TEXT NOT NULL,
-                rol TEXT NOT NULL,
-                email TEXT,
-                telefono TEXT,
-                activo INTEGER DEFAULT 1,
-                fecha_creacion DATETIME DEFAULT CURRENT_TIMESTAMP,
-                ultimo_login DATETIME,
-                intentos_login INTEGER DEFAULT 0,
-                bloqueado INTEGER DEFAULT 0
-            )
-        """)
-
-        # Tabla de Clientes
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Clientes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nombre TEXT NOT NULL,
-                apellido TEXT NOT NULL,
-                dni TEXT UNIQUE,
-                telefono TEXT,
-                email TEXT,
-                direccion TEXT,
-                fecha_registro TEXT NOT NULL,
-                activo INTEGER DEFAULT 1,
-                tipo_cliente TEXT DEFAULT 'Normal',
-                limite_credito REAL DEFAULT 0,
-                notas TEXT
-            )
-        """)
-
-        # Tabla de Proveedores (Mejorada)
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Proveedores (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nombre TEXT NOT NULL,
-                contacto TEXT,
-                cargo TEXT,
-                telefono TEXT,
-                email TEXT,
-                website TEXT,
-                categoria TEXT,
-                estado TEXT DEFAULT 'Activo',
-                direccion TEXT,
-                ruc TEXT,
-                tipo_negocio TEXT,
-                terminos_pago TEXT,
-                limite_credito REAL DEFAULT 0,
-                notas TEXT,
-                calificacion INTEGER DEFAULT 3,
-                fecha_registro DATETIME DEFAULT CURRENT_TIMESTAMP,
-                fecha_actualizacion DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Tabla de Categorías de Productos
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Categorias (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nombre TEXT UNIQUE NOT NULL,
-                descripcion TEXT,
-                activa INTEGER DEFAULT 1,
-                fecha_creacion DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Tabla de Productos (Mejorada)
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Productos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nombre TEXT NOT NULL,
-                descripcion TEXT,
-                precio REAL NOT NULL,
-                costo REAL,
-                stock INTEGER NOT NULL,
-                stock_minimo INTEGER DEFAULT 10,
-                categoria_id INTEGER,
-                proveedor_id INTEGER,
-                sku TEXT UNIQUE,
-                codigo_barras TEXT,
-                unidad_medida TEXT DEFAULT 'Unidad',
-                impuesto REAL DEFAULT 0.15,
-                activo INTEGER DEFAULT 1,
-                fecha_creacion DATETIME DEFAULT CURRENT_TIMESTAMP,
-                fecha_actualizacion DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (categoria_id) REFERENCES Categorias(id),
-                FOREIGN KEY (proveedor_id) REFERENCES Proveedores(id)
-            )
-        """)
+# Upsert de Configuracion; texto fijo para reutilizar la sentencia preparada
+SQL_UPSERT_CONFIG = """
+    INSERT INTO Configuracion (clave, valor, fecha_actualizacion)
+    VALUES (?, ?, datetime('now'))
+    ON CONFLICT(clave) DO UPDATE SET
+        valor = excluded.valor,
+        fecha_actualizacion = excluded.fecha_actualizacion
+"""
 
-        # Tabla de Descuentos (Mejorada)
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Descuentos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nombre TEXT NOT NULL,
-                tipo TEXT,
-                porcentaje REAL NOT NULL,
-                monto_minimo REAL DEFAULT 0,
-                fecha_inicio DATE,
-                fecha_fin DATE,
-                activo INTEGER DEFAULT 1,
-                aplica_categoria TEXT,
-                aplica_producto TEXT,
-                maximo_usos INTEGER DEFAULT 0,
-                usos_actual INTEGER DEFAULT 0
-            )
-        """)
+# Sentencias de las rutas más frecuentes; el texto constante garantiza
+# aciertos en el cache de sentencias preparadas de sqlite3
+SQL_UPDATE_STOCK = "UPDATE Productos SET stock = ? WHERE id = ?"
+# Registra el movimiento calculando stock anterior y nuevo en SQL a partir
+# de la fila actual del producto; ?1 tipo, ?2 cantidad, ?6 producto
+SQL_INSERT_MOVIMIENTO = """
+    INSERT INTO MovimientosInventario
+        (producto_id, tipo_movimiento, cantidad, stock_anterior, stock_nuevo, motivo, referencia, usuario_id)
+    SELECT id, ?1, ?2, stock,
+           CASE ?1 WHEN 'entrada' THEN stock + ?2 WHEN 'salida' THEN stock - ?2 ELSE ?2 END,
+           ?3, ?4, ?5
+    FROM Productos WHERE id = ?6
+    RETURNING stock_nuevo
+"""
+SQL_INSERT_AUDITORIA = """
+    INSERT INTO Auditoria (usuario_id, accion, modulo, descripcion, ip_address, user_agent)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
 
-        # Tabla de Ventas (Mejorada)
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Ventas (
-                id TEXT PRIMARY KEY,
-                fecha TEXT NOT NULL,
-                total REAL NOT NULL,
-                subtotal REAL,
-                impuesto REAL,
-                descuento_total REAL DEFAULT 0,
-                monto_pagado REAL,
-                vuelto REAL,
-                usuario_id INTEGER,
-                id_cliente INTEGER,
-                tipo_recibo TEXT,
-                estado TEXT DEFAULT 'Completada',
-                metodo_pago TEXT DEFAULT 'Efectivo',
-                notas TEXT,
-                FOREIGN KEY (id_cliente) REFERENCES Clientes(id)
-            )
-        """)
+# Plantilla de recibo por defecto: archivo junto a este módulo, leído solo
+# al sembrar Configuracion
+_RECEIPT_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "receipt_template.html")
+
+# Esquema completo: todas las tablas en un solo script (create_tables lo
+# ejecuta con executescript dentro de una transacción)
+SCHEMA_SQL = """
+-- Tabla de Configuración del Sistema (WITHOUT ROWID: un solo B-tree
+-- agrupado por clave, sin rowid ni índice aparte)
+CREATE TABLE IF NOT EXISTS Configuracion (
+    clave TEXT PRIMARY KEY,
+    valor TEXT,
+    descripcion TEXT,
+    categoria TEXT,
+    fecha_actualizacion DATETIME DEFAULT CURRENT_TIMESTAMP
+) WITHOUT ROWID;
+
+-- Tabla de Usuarios
+CREATE TABLE IF NOT EXISTS Usuarios (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre TEXT NOT NULL,
+    usuario TEXT UNIQUE NOT NULL,
+    contrasena TEXT NOT NULL,
+    rol TEXT NOT NULL,
+    email TEXT,
+    telefono TEXT,
+    activo INTEGER DEFAULT 1,
+    fecha_creacion DATETIME DEFAULT CURRENT_TIMESTAMP,
+    ultimo_login DATETIME,
+    intentos_login INTEGER DEFAULT 0,
+    bloqueado INTEGER DEFAULT 0
+);
+
+-- Tabla de Clientes
+CREATE TABLE IF NOT EXISTS Clientes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre TEXT NOT NULL,
+    apellido TEXT NOT NULL,
+    dni TEXT UNIQUE,
+    telefono TEXT,
+    email TEXT,
+    direccion TEXT,
+    fecha_registro TEXT NOT NULL,
+    activo INTEGER DEFAULT 1,
+    tipo_cliente TEXT DEFAULT 'Normal',
+    limite_credito REAL DEFAULT 0,
+    notas TEXT
+);
+
+-- Tabla de Proveedores (Mejorada)
+CREATE TABLE IF NOT EXISTS Proveedores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre TEXT NOT NULL,
+    contacto TEXT,
+    cargo TEXT,
+    telefono TEXT,
+    email TEXT,
+    website TEXT,
+    categoria TEXT,
+    estado TEXT DEFAULT 'Activo',
+    direccion TEXT,
+    ruc TEXT,
+    tipo_negocio TEXT,
+    terminos_pago TEXT,
+    limite_credito REAL DEFAULT 0,
+    notas TEXT,
+    calificacion INTEGER DEFAULT 3,
+    fecha_registro DATETIME DEFAULT CURRENT_TIMESTAMP,
+    fecha_actualizacion DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Tabla de Categorías de Productos
+CREATE TABLE IF NOT EXISTS Categorias (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre TEXT UNIQUE NOT NULL,
+    descripcion TEXT,
+    activa INTEGER DEFAULT 1,
+    fecha_creacion DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Tabla de Productos (Mejorada)
+CREATE TABLE IF NOT EXISTS Productos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre TEXT NOT NULL,
+    descripcion TEXT,
+    precio REAL NOT NULL,
+    costo REAL,
+    stock INTEGER NOT NULL,
+    stock_minimo INTEGER DEFAULT 10,
+    categoria_id INTEGER,
+    proveedor_id INTEGER,
+    sku TEXT UNIQUE,
+    codigo_barras TEXT,
+    unidad_medida TEXT DEFAULT 'Unidad',
+    impuesto REAL DEFAULT 0.15,
+    activo INTEGER DEFAULT 1,
+    fecha_creacion DATETIME DEFAULT CURRENT_TIMESTAMP,
+    fecha_actualizacion DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (categoria_id) REFERENCES Categorias(id),
+    FOREIGN KEY (proveedor_id) REFERENCES Proveedores(id)
+);
+
+-- Tabla de Descuentos (Mejorada)
+CREATE TABLE IF NOT EXISTS Descuentos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre TEXT NOT NULL,
+    tipo TEXT,
+    porcentaje REAL NOT NULL,
+    monto_minimo REAL DEFAULT 0,
+    fecha_inicio DATE,
+    fecha_fin DATE,
+    activo INTEGER DEFAULT 1,
+    aplica_categoria TEXT,
+    aplica_producto TEXT,
+    maximo_usos INTEGER DEFAULT 0,
+    usos_actual INTEGER DEFAULT 0
+);
+
+-- Tabla de Ventas (Mejorada); la clave es el id de venta generado
+-- por la aplicación, así que se agrupa directamente por él
+CREATE TABLE IF NOT EXISTS Ventas (
+    id TEXT PRIMARY KEY,
+    fecha TEXT NOT NULL,
+    total REAL NOT NULL,
+    subtotal REAL,
+    impuesto REAL,
+    descuento_total REAL DEFAULT 0,
+    monto_pagado REAL,
+    vuelto REAL,
+    usuario_id INTEGER,
+    id_cliente INTEGER,
+    tipo_recibo TEXT,
+    estado TEXT DEFAULT 'Completada',
+    metodo_pago TEXT DEFAULT 'Efectivo',
+    notas TEXT,
+    FOREIGN KEY (id_cliente) REFERENCES Clientes(id)
+) WITHOUT ROWID;
+
+-- Tabla de Detalle de Venta (Mejorada)
+CREATE TABLE IF NOT EXISTS DetalleVenta (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    venta_id TEXT,
+    producto_id INTEGER,
+    nombre_producto TEXT,
+    cantidad INTEGER,
+    precio_unitario REAL,
+    descuento REAL DEFAULT 0,
+    impuesto REAL DEFAULT 0,
+    subtotal REAL,
+    FOREIGN KEY (venta_id) REFERENCES Ventas(id),
+    FOREIGN KEY (producto_id) REFERENCES Productos(id)
+);
+
+-- Tabla de Inventario (Movimientos de stock)
+CREATE TABLE IF NOT EXISTS MovimientosInventario (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    producto_id INTEGER,
+    tipo_movimiento TEXT, -- 'entrada', 'salida', 'ajuste'
+    cantidad INTEGER,
+    stock_anterior INTEGER,
+    stock_nuevo INTEGER,
+    motivo TEXT,
+    referencia TEXT, -- ID de venta, compra, etc.
+    usuario_id INTEGER,
+    fecha_movimiento DATETIME DEFAULT CURRENT_TIMESTAMP,
+    notas TEXT,
+    FOREIGN KEY (producto_id) REFERENCES Productos(id)
+);
+
+-- Tabla de Compras/Órdenes de Compra
+CREATE TABLE IF NOT EXISTS Compras (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    proveedor_id INTEGER,
+    numero_orden TEXT UNIQUE,
+    fecha_orden DATE,
+    fecha_esperada DATE,
+    estado TEXT DEFAULT 'Pendiente',
+    subtotal REAL,
+    impuesto REAL,
+    total REAL,
+    notas TEXT,
+    usuario_id INTEGER,
+    fecha_creacion DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (proveedor_id) REFERENCES Proveedores(id)
+);
+
+-- Tabla de Detalle de Compra
+CREATE TABLE IF NOT EXISTS DetalleCompra (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    compra_id INTEGER,
+    producto_id INTEGER,
+    nombre_producto TEXT,
+    cantidad INTEGER,
+    precio_unitario REAL,
+    subtotal REAL,
+    FOREIGN KEY (compra_id) REFERENCES Compras(id),
+    FOREIGN KEY (producto_id) REFERENCES Productos(id)
+);
+
+-- Tabla de Notificaciones
+CREATE TABLE IF NOT EXISTS Notificaciones (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    titulo TEXT NOT NULL,
+    mensaje TEXT NOT NULL,
+    tipo TEXT DEFAULT 'info', -- 'info', 'success', 'warning', 'error'
+    leida INTEGER DEFAULT 0,
+    accion_callback TEXT,
+    datos_accion TEXT,
+    usuario_id INTEGER,
+    fecha_creacion DATETIME DEFAULT CURRENT_TIMESTAMP,
+    fecha_leida DATETIME
+);
+
+-- Tabla de Auditoría (Logs del sistema)
+CREATE TABLE IF NOT EXISTS Auditoria (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    usuario_id INTEGER,
+    accion TEXT NOT NULL,
+    modulo TEXT,
+    descripcion TEXT,
+    ip_address TEXT,
+    user_agent TEXT,
+    fecha DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Tabla de Backups
+CREATE TABLE IF NOT EXISTS Backups (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre_archivo TEXT NOT NULL,
+    ruta TEXT NOT NULL,
+    tamano INTEGER,
+    fecha_creacion DATETIME DEFAULT CURRENT_TIMESTAMP,
+    usuario_id INTEGER,
+    notas TEXT,
+    automatico INTEGER DEFAULT 0
+);
+
+-- Tabla de Configuración de Empresa
+CREATE TABLE IF NOT EXISTS Empresa (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre TEXT NOT NULL,
+    ruc TEXT,
+    direccion TEXT,
+    telefono TEXT,
+    email TEXT,
+    website TEXT,
+    logo BLOB,
+    moneda TEXT DEFAULT 'HNL',
+    idioma TEXT DEFAULT 'es',
+    zona_horaria TEXT DEFAULT 'America/Tegucigalpa',
+    impuesto_por_defecto REAL DEFAULT 0.15
+);
+
+-- Tabla de Series de Facturación
+CREATE TABLE IF NOT EXISTS SeriesFacturacion (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    serie TEXT UNIQUE NOT NULL,
+    descripcion TEXT,
+    numero_actual INTEGER DEFAULT 1,
+    resolucion TEXT,
+    fecha_resolucion DATE,
+    numero_desde INTEGER,
+    numero_hasta INTEGER,
+    activa INTEGER DEFAULT 1
+);
+"""
 
-        # Tabla de Detalle de Venta (Mejorada)
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS DetalleVenta (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                venta_id TEXT,
-                producto_id INTEGER,
-                nombre_producto TEXT,
-                cantidad INTEGER,
-                precio_unitario REAL,
-                descuento REAL DEFAULT 0,
-                impuesto REAL DEFAULT 0,
-                subtotal REAL,
-                FOREIGN KEY (venta_id) REFERENCES Ventas(id),
-                FOREIGN KEY (producto_id) REFERENCES Productos(id)
-            )
-        """)
+# Índices de claves foráneas y columnas usadas en filtros frecuentes. Van
+# aparte, sentencia a sentencia: bases creadas con versiones anteriores
+# pueden no tener alguna de las columnas y executescript se detendría en
+# el primer error.
+SCHEMA_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_productos_categoria ON Productos(categoria_id)",
+    "CREATE INDEX IF NOT EXISTS idx_productos_proveedor ON Productos(proveedor_id)",
+    # Parcial y cubriente para get_productos_bajo_stock: solo productos
+    # activos, con todas las columnas que lee la consulta (id es el rowid;
+    # activo debe figurar para que SQLite no vuelva a la tabla)
+    "CREATE INDEX IF NOT EXISTS idx_productos_bajo_stock ON Productos(stock, stock_minimo, nombre, activo) WHERE activo = 1",
+    # Cubre las estadísticas de ventas: rango por fecha leyendo solo el índice
+    "CREATE INDEX IF NOT EXISTS idx_ventas_fecha_total ON Ventas(fecha, total)",
+    "CREATE INDEX IF NOT EXISTS idx_ventas_cliente ON Ventas(id_cliente)",
+    "CREATE INDEX IF NOT EXISTS idx_detalleventa_venta ON DetalleVenta(venta_id)",
+    "CREATE INDEX IF NOT EXISTS idx_detalleventa_producto ON DetalleVenta(producto_id)",
+    "CREATE INDEX IF NOT EXISTS idx_movimientos_producto_fecha ON MovimientosInventario(producto_id, fecha_movimiento)",
+    # Parcial: solo notificaciones sin leer, así el índice no crece con el historial
+    "CREATE INDEX IF NOT EXISTS idx_notificaciones_pendientes ON Notificaciones(usuario_id, fecha_creacion DESC) WHERE leida = 0",
+    "CREATE INDEX IF NOT EXISTS idx_auditoria_usuario_fecha ON Auditoria(usuario_id, fecha)",
+    "CREATE INDEX IF NOT EXISTS idx_compras_proveedor ON Compras(proveedor_id)",
+    "CREATE INDEX IF NOT EXISTS idx_detallecompra_compra ON DetalleCompra(compra_id)",
+)
+
+# Búsqueda de clientes: índice FTS5 de contenido externo sobre Clientes
+# (solo guarda los tokens) y triggers que lo mantienen sincronizado
+SCHEMA_FTS = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS Clientes_fts USING fts5(
+        nombre, apellido, dni, telefono, email,
+        content='Clientes', content_rowid='id'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS clientes_fts_ai AFTER INSERT ON Clientes BEGIN
+        INSERT INTO Clientes_fts(rowid, nombre, apellido, dni, telefono, email)
+        VALUES (new.id, new.nombre, new.apellido, new.dni, new.telefono, new.email);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS clientes_fts_ad AFTER DELETE ON Clientes BEGIN
+        INSERT INTO Clientes_fts(Clientes_fts, rowid, nombre, apellido, dni, telefono, email)
+        VALUES ('delete', old.id, old.nombre, old.apellido, old.dni, old.telefono, old.email);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS clientes_fts_au
+    AFTER UPDATE OF nombre, apellido, dni, telefono, email ON Clientes BEGIN
+        INSERT INTO Clientes_fts(Clientes_fts, rowid, nombre, apellido, dni, telefono, email)
+        VALUES ('delete', old.id, old.nombre, old.apellido, old.dni, old.telefono, old.email);
+        INSERT INTO Clientes_fts(rowid, nombre, apellido, dni, telefono, email)
+        VALUES (new.id, new.nombre, new.apellido, new.dni, new.telefono, new.email);
+    END""",
+)
+
+# Auditoría en segundo plano: cada cuánto se escribe un lote y marca que
+# pide al hilo escritor vaciar la cola y terminar
+_AUDIT_FLUSH_INTERVAL = 0.1
+_AUDIT_STOP = object()
+
+# Versión del esquema guardada en PRAGMA user_version. Al abrir un archivo
+# con una versión menor se vuelven a aplicar SCHEMA_SQL, SCHEMA_INDEXES,
+# SCHEMA_FTS y las semillas (todo idempotente); increméntala al cambiar
+# cualquiera de ellos.
+SCHEMA_VERSION = 2
+
+# Tamaño del cache de sentencias preparadas por conexión (sqlite3 usa 128)
+_CACHED_STATEMENTS = 256
+
+# Parámetros de scrypt para las contraseñas de Usuarios
+_SCRYPT_N, _SCRYPT_R, _SCRYPT_P = 2 ** 14, 8, 1
+
+
+def hash_password(contrasena):
+    """Devuelve 'scrypt$<sal>$<hash>' (hex) para guardar en Usuarios.contrasena."""
+    sal = os.urandom(16)
+    digest = hashlib.scrypt(contrasena.encode(), salt=sal, n=_SCRYPT_N, r=_SCRYPT_R, p=_SCRYPT_P)
+    return f"scrypt${sal.hex()}${digest.hex()}"
+
+
+def verify_password(contrasena, guardada):
+    """Compara en tiempo constante; acepta también contraseñas antiguas en texto plano."""
+    if not guardada.startswith("scrypt$"):
+        return hmac.compare_digest(contrasena.encode(), guardada.encode())
+    _, sal, digest = guardada.split("$")
+    calculado = hashlib.scrypt(contrasena.encode(), salt=bytes.fromhex(sal),
+                               n=_SCRYPT_N, r=_SCRYPT_R, p=_SCRYPT_P)
+    return hmac.compare_digest(calculado, bytes.fromhex(digest))
 
-        # Tabla de Inventario (Movimientos de stock)
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS MovimientosInventario (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                producto_id INTEGER,
-                tipo_movimiento TEXT, -- 'entrada', 'salida', 'ajuste'
-                cantidad INTEGER,
-                stock_anterior INTEGER,
-                stock_nuevo INTEGER,
-                motivo TEXT,
-                referencia TEXT, -- ID de venta, compra, etc.
-                usuario_id INTEGER,
-                fecha_movimiento DATETIME DEFAULT CURRENT_TIMESTAMP,
-                notas TEXT,
-                FOREIGN KEY (producto_id) REFERENCES Productos(id)
-            )
-        """)
 
-        # Tabla de Compras/Órdenes de Compra
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Compras (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                proveedor_id INTEGER,
-                numero_orden TEXT UNIQUE,
-                fecha_orden DATE,
-                fecha_esperada DATE,
-                estado TEXT DEFAULT 'Pendiente',
-                subtotal REAL,
-                impuesto REAL,
-                total REAL,
-                notas TEXT,
-                usuario_id INTEGER,
-                fecha_creacion DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (proveedor_id) REFERENCES Proveedores(id)
-            )
-        """)
+class DBManager:
+    """Maneja la conexión a SQLite y operaciones CRUD/Setup."""
 
-        # Tabla de Detalle de Compra
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS DetalleCompra (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                compra_id INTEGER,
-                producto_id INTEGER,
-                nombre_producto TEXT,
-                cantidad INTEGER,
-                precio_unitario REAL,
-                subtotal REAL,
-                FOREIGN KEY (compra_id) REFERENCES Compras(id),
-                FOREIGN KEY (producto_id) REFERENCES Productos(id)
-            )
-        """)
+    def __init__(self, db_name="erp_profesional.db", journal_mode="WAL", synchronous="NORMAL",
+                 cache_size=-65536, mmap_size=268435456, busy_timeout=5000, foreign_keys=False):
+        """Abre la base de datos y ajusta sus PRAGMA.
+
+        La conexión trabaja en modo autocommit (isolation_level=None): cada
+        sentencia suelta se confirma sola y las escrituras agrupadas usan
+        transaction(), que abre BEGIN IMMEDIATE de forma explícita.
+        cache_size negativo se expresa en KiB (-65536 = 64 MB); mmap_size en
+        bytes (256 MB; 0 desactiva la E/S mapeada en memoria). foreign_keys
+        queda desactivado por defecto: varios módulos borran filas que aún
+        están referenciadas (p. ej. productos con ventas).
+        """
+        self.db_name = db_name
+        self._busy_timeout = int(busy_timeout)
+        self.conn = sqlite3.connect(
+            db_name,
+            cached_statements=_CACHED_STATEMENTS,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        # WAL: lectores concurrentes (backups en segundo plano) y un solo
+        # fsync por checkpoint en lugar de uno por commit
+        self.conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        self.conn.execute(f"PRAGMA synchronous={synchronous}")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        # Lecturas servidas desde la región mapeada, sin copia al cache de SQLite
+        self.conn.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self.conn.execute(f"PRAGMA cache_size={int(cache_size)}")
+        self.conn.execute(f"PRAGMA busy_timeout={int(busy_timeout)}")
+        self.conn.execute(f"PRAGMA foreign_keys={'ON' if foreign_keys else 'OFF'}")
+        self.cursor = self.conn.cursor()
+        # Profundidad de transaction(); dentro de un bloque los errores se propagan
+        self._tx_depth = 0
+        # Registros de auditoría pendientes; el hilo escritor arranca con el primero
+        self._audit_queue = queue.SimpleQueue()
+        self._audit_thread = None
+        # Tabla Configuracion en memoria (clave -> valor), propia de esta
+        # conexión: se llena con un único SELECT en la primera lectura y se
+        # actualiza en cada escritura
+        self._cfg_cache = None
+        # Sentencias con nombre: el texto fijo se prepara una vez y sqlite3
+        # la reutiliza desde su cache de sentencias
+        self._prepared = {}
+        self.prepare("login", "SELECT id, nombre, rol, contrasena FROM Usuarios WHERE usuario = ?")
+        # Esquema y semillas solo si el archivo viene de una versión anterior.
+        # La versión se marca únicamente si todo se aplicó; si algo se omitió
+        # (esquema antiguo, SQLite sin FTS5) se reintenta en el próximo inicio.
+        if self.fetch_scalar("PRAGMA user_version", default=0) < SCHEMA_VERSION:
+            esquema_completo = self.create_tables()
+            if self.insert_initial_data() and esquema_completo:
+                self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
 
-        # Tabla de Notificaciones
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Notificaciones (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                titulo TEXT NOT NULL,
-                mensaje TEXT NOT NULL,
-                tipo TEXT DEFAULT 'info', -- 'info', 'success', 'warning', 'error'
-                leida INTEGER DEFAULT 0,
-                accion_callback TEXT,
-                datos_accion TEXT,
-                usuario_id INTEGER,
-                fecha_creacion DATETIME DEFAULT CURRENT_TIMESTAMP,
-                fecha_leida DATETIME
-            )
-        """)
+    def create_tables(self):
+        """Crea todas las tablas e índices del sistema.
 
-        # Tabla de Auditoría (Logs del sistema)
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Auditoria (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                usuario_id INTEGER,
-                accion TEXT NOT NULL,
-                modulo TEXT,
-                descripcion TEXT,
-                ip_address TEXT,
-                user_agent TEXT,
-                fecha DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        Retorna False si se omitió algún índice o el índice de búsqueda.
+        """
+        try:
+            self.conn.executescript(f"BEGIN;\n{SCHEMA_SQL}\nCOMMIT;")
+        except sqlite3.Error:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            raise
+
+        completo = True
+        for indice in SCHEMA_INDEXES:
+            try:
+                self.cursor.execute(indice)
+            except sqlite3.OperationalError as e:
+                logger.warning("Índice omitido: %s", e)
+                completo = False
+
+        return self.create_search_index() and completo
+
+    def create_search_index(self):
+        """Crea Clientes_fts con sus triggers y lo llena con los clientes existentes.
+
+        Si SQLite no incluye FTS5 se omite (retorna False) y la búsqueda
+        sigue usando LIKE.
+        """
+        nuevo = self.fetch_scalar(
+            "SELECT 1 FROM sqlite_master WHERE name = 'Clientes_fts'"
+        ) is None
+        try:
+            with self.transaction():
+                for sentencia in SCHEMA_FTS:
+                    self.cursor.execute(sentencia)
+                if nuevo:
+                    self.cursor.execute("INSERT INTO Clientes_fts(Clientes_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError as e:
+            logger.warning("Búsqueda de texto completo omitida: %s", e)
+            return False
+        return True
 
-        # Tabla de Backups
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Backups (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nombre_archivo TEXT NOT NULL,
-                ruta TEXT NOT NULL,
-                tamano INTEGER,
-                fecha_creacion DATETIME DEFAULT CURRENT_TIMESTAMP,
-                usuario_id INTEGER,
-                notas TEXT,
-                automatico INTEGER DEFAULT 0
-            )
-        """)
+    def insert_initial_data(self):
+        """Inserta datos iniciales si las tablas están vacías.
 
-        # Tabla de Configuración de Empresa
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Empresa (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nombre TEXT NOT NULL,
-                ruc TEXT,
-                direccion TEXT,
-                telefono TEXT,
-                email TEXT,
-                website TEXT,
-                logo BLOB,
-                moneda TEXT DEFAULT 'HNL',
-                idioma TEXT DEFAULT 'es',
-                zona_horaria TEXT DEFAULT 'America/Tegucigalpa',
-                impuesto_por_defecto REAL DEFAULT 0.15
-            )
-        """)
+        Todas las semillas se escriben en una sola transacción (un único commit).
+        Retorna False si la transacción falló y se deshizo, o si alguna
+        semilla se omitió por un esquema antiguo.
+        """
+        try:
+            with self.transaction():
+                completo = self._insert_initial_rows()
+        except sqlite3.Error:
+            logger.exception("Error insertando datos iniciales")
+            return False
+        # Estadísticas para que el planificador elija los índices nuevos
+        self.conn.execute("ANALYZE")
+        return completo
+
+    def _table_empty(self, tabla):
+        """True si la tabla no tiene filas; lee como mucho una."""
+        return self.cursor.execute(f"SELECT 1 FROM {tabla} LIMIT 1").fetchone() is None
+
+    def _insert_initial_rows(self):
+        """Semillas de insert_initial_data(); no hace commit por sí misma.
+
+        Retorna False si alguna semilla se omitió.
+        """
+        completo = True
+
+        # Configuración del sistema: INSERT OR IGNORE añade solo las claves que
+        # falten, aunque la tabla ya tenga otras (p. ej. creadas a mano)
+        configuraciones = [
+            ('empresa_nombre', 'Mi Empresa ERP', 'Nombre legal de la empresa', 'empresa'),
+            ('empresa_ruc', '', 'RUC o NIT de la empresa', 'empresa'),
+            ('empresa_direccion', '', 'Dirección fiscal', 'empresa'),
+            ('empresa_telefono', '', 'Teléfono de contacto', 'empresa'),
+            ('empresa_email', '', 'Email de contacto', 'empresa'),
+            ('iva_por_defecto', '0.15', 'IVA por defecto para facturas', 'facturacion'),
+            ('moneda', 'HNL', 'Moneda principal del sistema', 'regional'),
+            ('idioma', 'es', 'Idioma del sistema', 'regional'),
+            ('zona_horaria', 'America/Tegucigalpa', 'Zona horaria', 'regional'),
+            ('recibo_template', self.default_receipt_template(), 'Plantilla de recibo HTML', 'sistema'),
+            ('notificaciones_stock', '1', 'Alertas de stock bajo', 'notificaciones'),
+            ('notificaciones_ventas', '1', 'Notificaciones de ventas', 'notificaciones'),
+            ('backup_automatico', '1', 'Backup automático habilitado', 'backup'),
+            ('session_timeout', '30', 'Tiempo de espera de sesión en minutos', 'seguridad'),
+        ]
 
-        # Tabla de Series de Facturación
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS SeriesFacturacion (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                serie TEXT UNIQUE NOT NULL,
-                descripcion TEXT,
-                numero_actual INTEGER DEFAULT 1,
-                resolucion TEXT,
-                fecha_resolucion DATE,
-                numero_desde INTEGER,
-                numero_hasta INTEGER,
-                activa INTEGER DEFAULT 1
+        try:
+            self.cursor.executemany(
+                "INSERT OR IGNORE INTO Configuracion (clave, valor, descripcion, categoria) VALUES (?, ?, ?, ?)",
+                configuraciones
             )
-        """)
-
-        self.conn.commit()
-
-    def insert_initial_data(self):
-        """Inserta datos iniciales si las tablas están vacías."""
-
-        # Configuración del sistema
-        if not self.fetch("SELECT * FROM Configuracion"):
-            configuraciones = [
-                ('empresa_nombre', 'Mi Empresa ERP', 'Nombre legal de la empresa', 'empresa'),
-                ('empresa_ruc', '', 'RUC o NIT de la empresa', 'empresa'),
-                ('empresa_direccion', '', 'Dirección fiscal', 'empresa'),
-                ('empresa_telefono', '', 'Teléfono de contacto', 'empresa'),
-                ('empresa_email', '', 'Email de contacto', 'empresa'),
-                ('iva_por_defecto', '0.15', 'IVA por defecto para facturas', 'facturacion'),
-                ('moneda', 'HNL', 'Moneda principal del sistema', 'regional'),
-                ('idioma', 'es', 'Idioma del sistema', 'regional'),
-                ('zona_horaria', 'America/Tegucigalpa', 'Zona horaria', 'regional'),
-                ('recibo_template', self.default_receipt_template(), 'Plantilla de recibo HTML', 'sistema'),
-                ('notificaciones_stock', '1', 'Alertas de stock bajo', 'notificaciones'),
-                ('notificaciones_ventas', '1', 'Notificaciones de ventas', 'notificaciones'),
-                ('backup_automatico', '1', 'Backup automático habilitado', 'backup'),
-                ('session_timeout', '30', 'Tiempo de espera de sesión en minutos', 'seguridad'),
-            ]
-            
-            for clave, valor, descripcion, categoria in configuraciones:
-                self.execute(
-                    "INSERT INTO Configuracion (clave, valor, descripcion, categoria) VALUES (?, ?, ?, ?)",
-                    (clave, valor, descripcion, categoria)
-                )
+        except sqlite3.OperationalError as e:
+            # Bases antiguas sin columnas descripcion/categoria
+            logger.warning("Configuración por defecto omitida: %s", e)
+            completo = False
 
         # Usuario administrador por defecto
-        if not self.fetch("SELECT * FROM Usuarios"):
-            self.execute(
+        if self._table_empty("Usuarios"):
+            self.cursor.execute(
                 "INSERT INTO Usuarios (nombre, usuario, contrasena, rol, email) VALUES (?, ?, ?, ?, ?)",
-                ("Administrador Principal", "admin", "1234", "Administrador", "admin@empresa.com"),
+                ("Administrador Principal", "admin", hash_password("1234"), "Administrador", "admin@empresa.com"),
             )
 
         # Proveedor de ejemplo
-        if not self.fetch("SELECT * FROM Proveedores"):
-            self.execute(
+        if self._table_empty("Proveedores"):
+            self.cursor.execute(
                 """INSERT INTO Proveedores 
                    (nombre, contacto, cargo, telefono, email, categoria, estado, direccion, ruc) 
                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
@@ -360,7 +568,7 @@ class DBManager:
             )
 
         # Categorías de productos
-        if not self.fetch("SELECT * FROM Categorias"):
+        if self._table_empty("Categorias"):
             categorias = [
                 ("Tecnología", "Productos tecnológicos y electrónicos"),
                 ("Oficina", "Suministros de oficina"),
@@ -368,31 +576,29 @@ class DBManager:
                 ("Electrodomésticos", "Electrodomésticos y línea blanca"),
             ]
             
-            for nombre, descripcion in categorias:
-                self.execute(
-                    "INSERT INTO Categorias (nombre, descripcion) VALUES (?, ?)",
-                    (nombre, descripcion)
-                )
+            self.cursor.executemany(
+                "INSERT INTO Categorias (nombre, descripcion) VALUES (?, ?)",
+                categorias
+            )
 
         # Descuentos predefinidos
-        if not self.fetch("SELECT * FROM Descuentos"):
+        if self._table_empty("Descuentos"):
             descuentos = [
                 ("Docena 10%", "Docena", 0.10, 0, None, None, 1),
                 ("Mayorista 15%", "Mayorista", 0.15, 1000, None, None, 1),
                 ("Cliente Frecuente 5%", "Fidelidad", 0.05, 0, None, None, 1),
             ]
-            
-            for nombre, tipo, porcentaje, monto_minimo, fecha_inicio, fecha_fin, activo in descuentos:
-                self.execute(
-                    "INSERT INTO Descuentos (nombre, tipo, porcentaje, monto_minimo, fecha_inicio, fecha_fin, activo) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                    (nombre, tipo, porcentaje, monto_minimo, fecha_inicio, fecha_fin, activo)
-                )
+
+            self.cursor.executemany(
+                "INSERT INTO Descuentos (nombre, tipo, porcentaje, monto_minimo, fecha_inicio, fecha_fin, activo) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                descuentos
+            )
 
         # Productos de ejemplo
-        if not self.fetch("SELECT * FROM Productos"):
+        if self._table_empty("Productos"):
             # Obtener IDs de categoría y proveedor
-            categoria_tec = self.fetch("SELECT id FROM Categorias WHERE nombre = 'Tecnología'")[0][0]
-            proveedor_id = self.fetch("SELECT id FROM Proveedores LIMIT 1")[0][0]
+            categoria_tec = self.fetch_scalar("SELECT id FROM Categorias WHERE nombre = 'Tecnología'")
+            proveedor_id = self.fetch_scalar("SELECT id FROM Proveedores LIMIT 1")
             
             productos_ejemplo = [
                 ('Monitor 27" 4K', "Monitor 4K profesional para diseño", 320.00, 200.00, 15, 5, categoria_tec, proveedor_id, "MON-27-4K", "1234567890123"),
@@ -401,17 +607,16 @@ class DBManager:
                 ("Laptop HP EliteBook", "i5, 8GB RAM, 256GB SSD, 14\"", 650.00, 450.00, 8, 2, categoria_tec, proveedor_id, "LAP-HP-ELITE", "1234567890126"),
                 ("Impresora Láser", "Impresora láser blanco y negro", 150.00, 90.00, 12, 3, categoria_tec, proveedor_id, "IMP-LAS-BN", "1234567890127"),
             ]
-            
-            for nombre, descripcion, precio, costo, stock, stock_minimo, categoria_id, proveedor_id, sku, codigo_barras in productos_ejemplo:
-                self.execute(
-                    """INSERT INTO Productos 
-                       (nombre, descripcion, precio, costo, stock, stock_minimo, categoria_id, proveedor_id, sku, codigo_barras) 
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (nombre, descripcion, precio, costo, stock, stock_minimo, categoria_id, proveedor_id, sku, codigo_barras)
-                )
+
+            self.cursor.executemany(
+                """INSERT INTO Productos 
+                   (nombre, descripcion, precio, costo, stock, stock_minimo, categoria_id, proveedor_id, sku, codigo_barras) 
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                productos_ejemplo
+            )
 
         # Clientes de ejemplo
-        if not self.fetch("SELECT * FROM Clientes"):
+        if self._table_empty("Clientes"):
             fecha_actual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
             clientes_ejemplo = [
@@ -436,18 +641,17 @@ class DBManager:
                     1, "Normal", 2000.00, "Preferencia por productos tecnológicos"
                 ),
             ]
-            
-            for datos in clientes_ejemplo:
-                self.execute(
-                    """INSERT INTO Clientes 
-                       (nombre, apellido, dni, telefono, email, direccion, fecha_registro, activo, tipo_cliente, limite_credito, notas) 
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    datos
-                )
+
+            self.cursor.executemany(
+                """INSERT INTO Clientes 
+                   (nombre, apellido, dni, telefono, email, direccion, fecha_registro, activo, tipo_cliente, limite_credito, notas) 
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                clientes_ejemplo
+            )
 
         # Información de empresa
-        if not self.fetch("SELECT * FROM Empresa"):
-            self.execute(
+        if self._table_empty("Empresa"):
+            self.cursor.execute(
                 """INSERT INTO Empresa 
                    (nombre, ruc, direccion, telefono, email, moneda, impuesto_por_defecto) 
                    VALUES (?, ?, ?, ?, ?, ?, ?)""",
@@ -455,253 +659,218 @@ class DBManager:
                  "2234-5678", "info@miempresa.com", "HNL", 0.15)
             )
 
-        # Series de facturación
-        if not self.fetch("SELECT * FROM SeriesFacturacion"):
-            self.execute(
-                """INSERT INTO SeriesFacturacion 
-                   (serie, descripcion, numero_actual, resolucion, fecha_resolucion, numero_desde, numero_hasta) 
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                ("A", "Serie principal para facturas", 1, "RES-2024-001", 
-                 "2024-01-01", 1, 100000)
-            )
-
-        self.conn.commit()
+        # Serie de facturación principal (única por serie)
+        self.cursor.execute(
+            """INSERT OR IGNORE INTO SeriesFacturacion 
+               (serie, descripcion, numero_actual, resolucion, fecha_resolucion, numero_desde, numero_hasta) 
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            ("A", "Serie principal para facturas", 1, "RES-2024-001", 
+             "2024-01-01", 1, 100000)
+        )
+        return completo
 
     def default_receipt_template(self):
-        """Plantilla HTML por defecto para recibos."""
-        return """<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>Recibo {{numero_factura}}</title>
-    <style>
-        body { 
-            font-family: 'Arial', sans-serif; 
-            margin: 0; 
-            padding: 20px; 
-            font-size: 10pt; 
-            background: #f8f9fa;
-        }
-        .recibo { 
-            width: 300px; 
-            margin: 0 auto; 
-            background: white;
-            border: 1px solid #ddd;
-            border-radius: 8px;
-            padding: 20px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }
-        .header { 
-            text-align: center; 
-            border-bottom: 2px solid #3B82F6;
-            padding-bottom: 10px;
-            margin-bottom: 15px;
-        }
-        .company-name { 
-            font-size: 16pt; 
-            font-weight: bold;
-            color: #1E293B;
-            margin: 0;
-        }
-        .company-info { 
-            font-size: 9pt; 
-            color: #64748B;
-            margin: 5px 0;
-        }
-        .sale-info { 
-            background: #F8FAFC;
-            padding: 10px;
-            border-radius: 6px;
-            margin-bottom: 15px;
-        }
-        .detail { 
-            margin-top: 15px; 
-        }
-        .items-table {
-            width: 100%;
-            border-collapse: collapse;
-            margin: 10px 0;
-        }
-        .items-table th {
-            background: #3B82F6;
-            color: white;
-            padding: 8px;
-            text-align: left;
-            font-size: 9pt;
-        }
-        .items-table td {
-            padding: 6px 8px;
-            border-bottom: 1px solid #E2E8F0;
-            font-size: 9pt;
-        }
-        .total-section { 
-            margin-top: 15px; 
-            border-top: 2px solid #3B82F6; 
-            padding-top: 10px; 
-        }
-        .total-row {
-            display: flex;
-            justify-content: space-between;
-            margin: 5px 0;
-        }
-        .total { 
-            font-weight: bold; 
-            font-size: 12pt;
-            color: #1E293B;
-        }
-        .footer { 
-            margin-top: 15px; 
-            border-top: 1px solid #E2E8F0; 
-            padding-top: 10px; 
-            text-align: center; 
-            font-size: 8pt;
-            color: #94A3B8;
-        }
-        .thank-you {
-            color: #3B82F6;
-            font-weight: bold;
-            margin: 10px 0;
-        }
-    </style>
-</head>
-<body>
-    <div class="recibo">
-        <div class="header">
-            <h1 class="company-name">{{empresa_nombre}}</h1>
-            <p class="company-info">RUC: {{empresa_ruc}}</p>
-            <p class="company-info">{{empresa_direccion}}</p>
-            <p class="company-info">Tel: {{empresa_telefono}}</p>
-        </div>
-        
-        <div class="sale-info">
-            <p><strong>Factura:</strong> {{numero_factura}}</p>
-            <p><strong>Fecha:</strong> {{fecha}}</p>
-            <p><strong>Cliente:</strong> {{cliente_nombre}}</p>
-        </div>
-        
-        <div class="detail">
-            <table class="items-table">
-                <thead>
-                    <tr>
-                        <th>Producto</th>
-                        <th>Cant.</th>
-                        <th>Precio</th>
-                        <th>Total</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    {{items}}
-                </tbody>
-            </table>
-        </div>
-
-        <div class="total-section">
-            <div class="total-row">
-                <span>Subtotal:</span>
-                <span>${{subtotal}}</span>
-            </div>
-            <div class="total-row">
-                <span>IVA (15%):</span>
-                <span>${{iva}}</span>
-            </div>
-            <div class="total-row total">
-                <span>TOTAL:</span>
-                <span>${{total}}</span>
-            </div>
-            <div class="total-row">
-                <span>Monto Pagado:</span>
-                <span>${{monto_pagado}}</span>
-            </div>
-            <div class="total-row">
-                <span>Vuelto:</span>
-                <span>${{vuelto}}</span>
-            </div>
-        </div>
-
-        <div class="footer">
-            <p class="thank-you">¡Gracias por su compra!</p>
-            <p>Vuelva pronto</p>
-            <p>{{fecha_impresion}}</p>
-        </div>
-    </div>
-</body>
-</html>"""
+        """Plantilla HTML por defecto para recibos (receipt_template.html)."""
+        with open(_RECEIPT_TEMPLATE_PATH, encoding="utf-8") as f:
+            return f.read()
+
+    def _config_cache(self):
+        """Devuelve la cache de Configuracion, leyéndola si falta."""
+        if self._cfg_cache is None:
+            self._cfg_cache = dict(self.fetch("SELECT clave, valor FROM Configuracion"))
+        return self._cfg_cache
+
+    def invalidate_config_cache(self):
+        """Descarta la cache de Configuracion (p. ej. tras restaurar un backup)."""
+        self._cfg_cache = None
 
     def get_config(self, clave, default=None):
         """Obtiene un valor de configuración."""
-        result = self.fetch("SELECT valor FROM Configuracion WHERE clave = ?", (clave,))
-        return result[0][0] if result else default
+        return self._config_cache().get(clave, default)
 
     def set_config(self, clave, valor):
         """Establece o actualiza un valor de configuración."""
-        self.execute(
-            "INSERT OR REPLACE INTO Configuracion (clave, valor, fecha_actualizacion) VALUES (?, ?, datetime('now'))",
-            (clave, valor),
-        )
+        self.set_configs([(clave, valor)])
+
+    def set_configs(self, pares):
+        """Establece o actualiza varios valores de configuración en una sola transacción.
+
+        Solo se escriben las claves cuyo valor difiere del de la cache. Si la
+        escritura falla se deshace, la cache no cambia y el error se propaga.
+        """
+        cache = self._config_cache()
+        cambios = {clave: valor for clave, valor in pares
+                   if clave not in cache or cache[clave] != valor}
+        if not cambios:
+            return
+        try:
+            with self.transaction():
+                self.cursor.executemany(SQL_UPSERT_CONFIG, cambios.items())
+            cache.update(cambios)
+        except sqlite3.Error:
+            logger.exception("Error guardando configuraciones: %r", list(cambios))
+            raise
 
     def fetch(self, query, params=()):
         """Ejecuta una consulta SELECT y retorna los resultados."""
         try:
             self.cursor.execute(query, params)
             return self.cursor.fetchall()
-        except sqlite3.Error as e:
-            print(f"Error en consulta: {e}")
+        except sqlite3.Error:
+            logger.exception("Error en consulta: %s params=%r", query, params)
             return []
 
+    def fetch_one(self, query, params=()):
+        """Ejecuta una consulta SELECT y retorna solo la primera fila, o None."""
+        try:
+            return self.cursor.execute(query, params).fetchone()
+        except sqlite3.Error:
+            logger.exception("Error en consulta: %s params=%r", query, params)
+            return None
+
+    def fetch_scalar(self, query, params=(), default=None):
+        """Ejecuta una consulta SELECT y retorna la primera columna de la primera fila."""
+        row = self.fetch_one(query, params)
+        return row[0] if row else default
+
     def execute(self, query, params=()):
-        """Ejecuta una consulta INSERT/UPDATE/DELETE."""
+        """Ejecuta una consulta INSERT/UPDATE/DELETE.
+
+        Fuera de transaction() cada sentencia se confirma al momento; dentro,
+        el commit lo hace el bloque y los errores se propagan para deshacerlo.
+        """
         try:
             self.cursor.execute(query, params)
-            self.conn.commit()
             return self.cursor.lastrowid
-        except sqlite3.Error as e:
-            print(f"Error en operación: {e}")
+        except sqlite3.Error:
+            if self._tx_depth:
+                raise
+            logger.exception("Error en operación: %s params=%r", query, params)
+            return None
+
+    def execute_many(self, query, seq_params):
+        """Ejecuta la misma sentencia para cada tupla de parámetros con un solo commit."""
+        try:
+            with self.transaction():
+                self.cursor.executemany(query, seq_params)
+            return self.cursor.rowcount
+        except sqlite3.Error:
+            if self._tx_depth:
+                raise
+            logger.exception("Error en operación por lotes: %s", query)
             return None
 
+    def commit(self):
+        """Confirma la transacción abierta en la conexión, si la hay."""
+        self.conn.commit()
+
+    @contextmanager
+    def transaction(self):
+        """Agrupa varias escrituras en una transacción con un único commit.
+
+        with db.transaction():
+            db.execute(...)
+            db.execute(...)
+
+        Se confirma al salir del bloque y se deshace si ocurre una excepción.
+        Los bloques anidados se integran en la transacción exterior.
+        """
+        if self._tx_depth:
+            self._tx_depth += 1
+            try:
+                yield self
+            finally:
+                self._tx_depth -= 1
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        self._tx_depth = 1
+        try:
+            yield self
+        except BaseException:
+            self._tx_depth = 0
+            self.conn.rollback()
+            raise
+        self._tx_depth = 0
+        self.conn.commit()
+
+    def prepare(self, nombre, query):
+        """Registra una sentencia con nombre para exec_prepared()."""
+        self._prepared[nombre] = query
+
+    def exec_prepared(self, nombre, params=()):
+        """Ejecuta la sentencia registrada con prepare() y retorna los resultados."""
+        return self.fetch(self._prepared[nombre], params)
+
+    def autenticar_usuario(self, usuario, contrasena):
+        """Retorna (id, nombre, rol) si las credenciales son válidas, o None.
+
+        Las contraseñas antiguas en texto plano se migran a scrypt en el
+        primer login correcto.
+        """
+        row = self.fetch_one(self._prepared["login"], (usuario,))
+        if not row or not verify_password(contrasena, row[3]):
+            return None
+        user_id, nombre, rol, guardada = row
+        if not guardada.startswith("scrypt$"):
+            self.execute("UPDATE Usuarios SET contrasena = ? WHERE id = ?",
+                         (hash_password(contrasena), user_id))
+        return user_id, nombre, rol
+
     def close(self):
-        """Cierra la conexión a la base de datos."""
+        """Escribe la auditoría pendiente y cierra la conexión a la base de datos."""
+        if self._audit_thread is not None:
+            self._audit_queue.put(_AUDIT_STOP)
+            self._audit_thread.join()
+            self._audit_thread = None
+        # Refresco incremental de estadísticas; solo analiza lo que lo necesita
+        self.conn.execute("PRAGMA optimize")
         self.conn.close()
 
     # Métodos adicionales para funcionalidades específicas
 
     def get_empresa_info(self):
         """Obtiene la información de la empresa."""
-        result = self.fetch("SELECT * FROM Empresa LIMIT 1")
+        # Columnas explícitas: no se lee el BLOB del logo
+        result = self.fetch_one("""
+            SELECT nombre, ruc, direccion, telefono, email, moneda, impuesto_por_defecto
+            FROM Empresa LIMIT 1
+        """)
         if result:
+            nombre, ruc, direccion, telefono, email, moneda, impuesto = result
             return {
-                'nombre': result[0][1],
-                'ruc': result[0][2],
-                'direccion': result[0][3],
-                'telefono': result[0][4],
-                'email': result[0][5],
-                'moneda': result[0][7],
-                'impuesto_por_defecto': result[0][10]
+                'nombre': nombre,
+                'ruc': ruc,
+                'direccion': direccion,
+                'telefono': telefono,
+                'email': email,
+                'moneda': moneda,
+                'impuesto_por_defecto': impuesto
             }
         return None
 
     def registrar_movimiento_inventario(self, producto_id, tipo, cantidad, motivo, referencia=None, usuario_id=None):
-        """Registra un movimiento en el inventario."""
-        # Obtener stock actual
-        stock_actual = self.fetch("SELECT stock FROM Productos WHERE id = ?", (producto_id,))[0][0]
-        
-        if tipo == 'entrada':
-            nuevo_stock = stock_actual + cantidad
-        elif tipo == 'salida':
-            nuevo_stock = stock_actual - cantidad
-        else:  # ajuste
-            nuevo_stock = cantidad
-        
-        # Actualizar stock del producto
-        self.execute("UPDATE Productos SET stock = ? WHERE id = ?", (nuevo_stock, producto_id))
-        
-        # Registrar movimiento
-        self.execute(
-            """INSERT INTO MovimientosInventario 
-               (producto_id, tipo_movimiento, cantidad, stock_anterior, stock_nuevo, motivo, referencia, usuario_id) 
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-            (producto_id, tipo, cantidad, stock_actual, nuevo_stock, motivo, referencia, usuario_id)
-        )
-        
+        """Registra un movimiento en el inventario y retorna el nuevo stock.
+
+        Movimiento y actualización de stock van en una misma transacción,
+        así ninguna otra conexión escribe entre la lectura del stock y su
+        actualización. Retorna None si el producto no existe.
+        """
+        try:
+            with self.transaction():
+                fila = self.cursor.execute(
+                    SQL_INSERT_MOVIMIENTO,
+                    (tipo, cantidad, motivo, referencia, usuario_id, producto_id)
+                ).fetchone()
+                if fila is None:
+                    return None
+                nuevo_stock = fila[0]
+                self.cursor.execute(SQL_UPDATE_STOCK, (nuevo_stock, producto_id))
+        except sqlite3.Error:
+            if self._tx_depth:
+                raise
+            logger.exception("Error registrando movimiento del producto %s", producto_id)
+            return None
+
         return nuevo_stock
 
     def get_productos_bajo_stock(self):
@@ -713,10 +882,15 @@ class DBManager:
         """)
 
     def get_estadisticas_ventas(self, periodo='mes'):
-        """Obtiene estadísticas de ventas."""
+        """Obtiene estadísticas de ventas.
+
+        fecha se guarda como 'AAAA-MM-DD HH:MM:SS', así que el mes y el día son
+        prefijos del texto; el rango sobre fecha y SUM(total) se resuelven
+        solo con idx_ventas_fecha_total.
+        """
         if periodo == 'mes':
             query = """
-                SELECT strftime('%Y-%m', fecha) as mes, COUNT(*), SUM(total)
+                SELECT substr(fecha, 1, 7) as mes, COUNT(*), SUM(total)
                 FROM Ventas 
                 WHERE fecha >= date('now', '-12 months')
                 GROUP BY mes
@@ -724,7 +898,7 @@ class DBManager:
             """
         else:  # día
             query = """
-                SELECT date(fecha) as dia, COUNT(*), SUM(total)
+                SELECT substr(fecha, 1, 10) as dia, COUNT(*), SUM(total)
                 FROM Ventas 
                 WHERE fecha >= date('now', '-30 days')
                 GROUP BY dia
@@ -754,9 +928,49 @@ class DBManager:
             )
 
     def registrar_auditoria(self, usuario_id, accion, modulo, descripcion, ip_address=None, user_agent=None):
-        """Registra una acción en la auditoría."""
-        return self.execute(
-            """INSERT INTO Auditoria (usuario_id, accion, modulo, descripcion, ip_address, user_agent) 
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (usuario_id, accion, modulo, descripcion, ip_address, user_agent)
-        )
\ No newline at end of file
+        """Registra una acción en la auditoría.
+
+        La fila se encola y un hilo la escribe en lote cada 100 ms, así la
+        interfaz no espera al commit; close() vacía la cola. No retorna id.
+        """
+        fila = (usuario_id, accion, modulo, descripcion, ip_address, user_agent)
+        if self.db_name == ":memory:":
+            # Otra conexión no vería la misma base en memoria
+            self.execute(SQL_INSERT_AUDITORIA, fila)
+            return
+        if self._audit_thread is None:
+            self._audit_thread = threading.Thread(
+                target=self._audit_writer, name="audit-writer", daemon=True
+            )
+            self._audit_thread.start()
+        self._audit_queue.put(fila)
+
+    def _audit_writer(self):
+        """Hilo escritor: vacía la cola de auditoría por lotes con su propia conexión."""
+        conn = sqlite3.connect(self.db_name, isolation_level=None)
+        conn.execute(f"PRAGMA busy_timeout={self._busy_timeout}")
+        try:
+            terminar = False
+            while not terminar:
+                lote = [self._audit_queue.get()]
+                time.sleep(_AUDIT_FLUSH_INTERVAL)
+                while True:
+                    try:
+                        lote.append(self._audit_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if any(fila is _AUDIT_STOP for fila in lote):
+                    terminar = True
+                    lote = [fila for fila in lote if fila is not _AUDIT_STOP]
+                if not lote:
+                    continue
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.executemany(SQL_INSERT_AUDITORIA, lote)
+                    conn.execute("COMMIT")
+                except sqlite3.Error:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    logger.exception("Error escribiendo %d registros de auditoría", len(lote))
+        finally:
+            conn.close()
\ No newline at end of file
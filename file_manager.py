@@ -251,8 +251,8 @@ class FileManager:
                        VALUES (?, ?, ?, ?, ?)"""
 
             try:
-                self.db.cursor.executemany(query, final_products)
-                self.db.conn.commit()
+                with self.db.transaction():
+                    self.db.cursor.executemany(query, final_products)
                 messagebox.showinfo(
                     "Éxito", f"{len(final_products)} productos importados."
                 )
@@ -1,14 +1,22 @@
 """
 frames/__init__.py
 Hace que frames sea un paquete importable
+
+Los frames se importan en el primer acceso (PEP 562): importar un
+submódulo como frames.notificaciones no carga dashboard, sales, etc.
 """
 
-from .dashboard import DashboardFrame
-from .product import ProductFrame
-from .suppliers import SupplierFrame
-from .config import ConfigFrame
-from .sales import SalesFrame
-from .clients import ClientsFrame
+import importlib
+
+# Nombre exportado -> submódulo que lo define
+_LAZY_EXPORTS = {
+    "DashboardFrame": ".dashboard",
+    "ProductFrame": ".product",
+    "SupplierFrame": ".suppliers",
+    "ConfigFrame": ".config",
+    "SalesFrame": ".sales",
+    "ClientsFrame": ".clients",
+}
 
 __all__ = [
     "DashboardFrame",
@@ -18,3 +26,15 @@ __all__ = [
     "SalesFrame",
     "ClientsFrame",
 ]
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
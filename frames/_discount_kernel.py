@@ -0,0 +1,31 @@
+"""
+frames/_discount_kernel.py
+Cálculo numérico de descuentos por línea, separado de la interfaz.
+Si numba está instalado el bucle se compila con @njit; si no, se usa
+la versión vectorizada de numpy. Sin fastmath: son montos de dinero y
+el resultado debe coincidir con el cálculo en Python.
+"""
+
+import numpy as np
+
+
+def _apply_discounts_loop(totals, pcts, min_amounts):
+    out = np.empty_like(totals)
+    for i in range(totals.shape[0]):
+        if totals[i] >= min_amounts[i]:
+            out[i] = totals[i] * pcts[i]
+        else:
+            out[i] = 0.0
+    return out
+
+
+try:
+    from numba import njit
+
+    apply_discounts = njit(cache=True)(_apply_discounts_loop)
+
+except ImportError:
+
+    def apply_discounts(totals, pcts, min_amounts):
+        """Monto de descuento por línea: totals * pcts donde totals >= min_amounts, si no 0."""
+        return np.where(totals >= min_amounts, totals * pcts, 0.0)
@@ -0,0 +1,23 @@
+"""
+frames/_json.py
+Serialización JSON compartida: usa orjson si está instalado y, si no,
+la librería estándar json con el mismo comportamiento.
+"""
+
+try:
+    import orjson
+
+    def dumps(obj, indent=False):
+        """Serializa a str UTF-8 (sin escapar caracteres no ASCII)"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+
+    loads = orjson.loads
+
+except ImportError:
+    import json
+
+    def dumps(obj, indent=False):
+        """Serializa a str UTF-8 (sin escapar caracteres no ASCII)"""
+        return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
+    loads = json.loads
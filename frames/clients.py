@@ -5,80 +5,188 @@ PySide6 con estilo Windows 11 profesional
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame,
-    QLineEdit, QTextEdit, QCheckBox, QTableWidget, QTableWidgetItem,
-    QHeaderView, QScrollArea, QGroupBox, QFormLayout, QMessageBox,
+    QLineEdit, QTextEdit, QCheckBox, QTableView,
+    QHeaderView, QScrollArea, QGroupBox, QFormLayout, QMessageBox, QFileDialog,
     QSplitter, QToolBar, QStatusBar, QComboBox, QProgressBar
 )
-from PySide6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve
-from PySide6.QtGui import QFont, QPalette, QColor, QIcon, QAction
+from PySide6.QtCore import (
+    Qt, QTimer, QPropertyAnimation, QEasingCurve, QAbstractTableModel, QModelIndex
+)
+from PySide6.QtGui import QFont, QPalette, QColor, QBrush, QIcon, QAction
 import csv
 import re
 from datetime import datetime
 
+# Filas leídas del cursor por cada escritura del CSV exportado
+EXPORT_CHUNK_ROWS = 10000
+
+# Columnas de Clientes en el orden en que se desempaquetan las filas
+_CLIENT_COLS = "id, nombre, apellido, dni, telefono, email, direccion, fecha_registro, activo"
+_CLIENT_COLS_C = ", ".join(f"c.{col}" for col in _CLIENT_COLS.split(", "))
+
+# Sentencias de save_client: texto fijo para que el cache de sentencias
+# de sqlite3 reutilice la compilada. La fecha de registro la pone SQLite
+# en hora local, con el mismo formato 'YYYY-MM-DD HH:MM:SS' de siempre.
+SQL_INSERT_CLIENT = """
+    INSERT INTO Clientes (nombre, apellido, dni, telefono, email, direccion, fecha_registro, activo)
+    VALUES (?, ?, ?, ?, ?, ?, datetime('now', 'localtime'), ?)
+"""
+SQL_UPDATE_CLIENT = """
+    UPDATE Clientes 
+    SET nombre=?, apellido=?, dni=?, telefono=?, email=?, direccion=?, activo=?
+    WHERE id=?
+"""
+
+def _fts_query(term):
+    """Convierte el texto buscado en una consulta FTS5: cada palabra como prefijo"""
+    return " ".join('"{}"*'.format(word.replace('"', '""')) for word in term.split())
+
+# Validadores del formulario, compilados una sola vez
+_EMAIL_RE = re.compile(r"^[^@]+@[^@]+\.[^@]+$")
+_DNI_RE = re.compile(r"^[0-9]{13}\Z")
+
+# Estilo de los campos de texto (formulario y buscador)
+_INPUT_QSS = """
+    QLineEdit {
+        background: white;
+        border: 1.5px solid #E2E8F0;
+        border-radius: 8px;
+        padding: 8px 12px;
+        font-family: 'Segoe UI';
+        font-size: 13px;
+        color: #1E293B;
+    }
+    QLineEdit:focus {
+        border-color: #3B82F6;
+        background: #F8FAFF;
+    }
+    QLineEdit::placeholder {
+        color: #9CA3AF;
+    }
+"""
+
 class AnimatedButton(QPushButton):
     """Botón con animaciones suaves al estilo Windows 11"""
     
+    # Hojas de estilo compartidas: el mismo texto para todos los botones
+    _PRIMARY_QSS = """
+        AnimatedButton {
+            background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                stop:0 #3B82F6, stop:1 #60A5FA);
+            border: none;
+            border-radius: 8px;
+            color: white;
+            font-weight: 600;
+            font-size: 13px;
+            padding: 8px 16px;
+        }
+        AnimatedButton:hover {
+            background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                stop:0 #2563EB, stop:1 #3B82F6);
+        }
+        AnimatedButton:pressed {
+            background: #1D4ED8;
+        }
+    """
+
+    _SECONDARY_QSS = """
+        AnimatedButton {
+            background: transparent;
+            border: 1.5px solid #E2E8F0;
+            border-radius: 8px;
+            color: #475569;
+            font-weight: 500;
+            font-size: 13px;
+            padding: 8px 16px;
+        }
+        AnimatedButton:hover {
+            background: #F1F5F9;
+            border-color: #CBD5E1;
+        }
+    """
+
+    _DANGER_QSS = """
+        AnimatedButton {
+            background: transparent;
+            border: 1.5px solid #FECACA;
+            border-radius: 8px;
+            color: #DC2626;
+            font-weight: 500;
+            font-size: 13px;
+            padding: 8px 16px;
+        }
+        AnimatedButton:hover {
+            background: #FEF2F2;
+            border-color: #FCA5A5;
+        }
+    """
+
     def __init__(self, text, parent=None):
         super().__init__(text, parent)
         self.setCursor(Qt.PointingHandCursor)
         self.setMinimumHeight(36)
         
     def set_primary_style(self):
-        self.setStyleSheet("""
-            AnimatedButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #3B82F6, stop:1 #60A5FA);
-                border: none;
-                border-radius: 8px;
-                color: white;
-                font-weight: 600;
-                font-size: 13px;
-                padding: 8px 16px;
-            }
-            AnimatedButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #2563EB, stop:1 #3B82F6);
-            }
-            AnimatedButton:pressed {
-                background: #1D4ED8;
-            }
-        """)
+        self.setStyleSheet(self._PRIMARY_QSS)
     
     def set_secondary_style(self):
-        self.setStyleSheet("""
-            AnimatedButton {
-                background: transparent;
-                border: 1.5px solid #E2E8F0;
-                border-radius: 8px;
-                color: #475569;
-                font-weight: 500;
-                font-size: 13px;
-                padding: 8px 16px;
-            }
-            AnimatedButton:hover {
-                background: #F1F5F9;
-                border-color: #CBD5E1;
-            }
-        """)
+        self.setStyleSheet(self._SECONDARY_QSS)
     
     def set_danger_style(self):
-        self.setStyleSheet("""
-            AnimatedButton {
-                background: transparent;
-                border: 1.5px solid #FECACA;
-                border-radius: 8px;
-                color: #DC2626;
-                font-weight: 500;
-                font-size: 13px;
-                padding: 8px 16px;
-            }
-            AnimatedButton:hover {
-                background: #FEF2F2;
-                border-color: #FCA5A5;
-            }
-        """)
+        self.setStyleSheet(self._DANGER_QSS)
 
-class ModernTableWidget(QTableWidget):
+class ClientsTableModel(QAbstractTableModel):
+    """Modelo de solo lectura para la tabla de clientes.
+
+    Guarda las tuplas de Clientes tal como vienen de fetch(); la vista solo
+    pide data() para las celdas visibles, sin crear un item por celda.
+    """
+
+    HEADERS = ("ID", "Nombre", "Apellido", "DNI", "Teléfono", "Email", "Estado")
+    # Un único pincel gris compartido por todas las celdas de clientes inactivos
+    _INACTIVE_BRUSH = QBrush(QColor("#94A3B8"))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def set_rows(self, rows):
+        """Reemplaza todas las filas del modelo"""
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def row_at(self, row):
+        return self._rows[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        cliente = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            col = index.column()
+            if col == 6:
+                return "Activo" if cliente[8] else "Inactivo"
+            value = cliente[col]
+            if col >= 3 and not value:
+                return "N/A"
+            return value if isinstance(value, str) else str(value)
+        if role == Qt.ForegroundRole and not cliente[8]:
+            return self._INACTIVE_BRUSH
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+class ModernTableView(QTableView):
     """Tabla moderna con estilo Windows 11"""
     
     def __init__(self, parent=None):
@@ -87,18 +195,18 @@ class ModernTableWidget(QTableWidget):
     
     def setup_ui(self):
         self.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background: white;
                 border: 1px solid #E2E8F0;
                 border-radius: 8px;
                 gridline-color: #F1F5F9;
                 outline: none;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px;
                 border-bottom: 1px solid #F1F5F9;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background: #DBEAFE;
                 color: #1E293B;
             }
@@ -119,8 +227,8 @@ class ModernTableWidget(QTableWidget):
         """)
         
         self.setAlternatingRowColors(True)
-        self.setSelectionBehavior(QTableWidget.SelectRows)
-        self.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.setSelectionBehavior(QTableView.SelectRows)
+        self.setEditTriggers(QTableView.NoEditTriggers)
         
         # Configurar header
         header = self.horizontalHeader()
@@ -135,6 +243,16 @@ class ClientsFrame(QWidget):
         self.app = parent
         self.db = parent.db if parent else None
         self.current_client_id = None
+        # Bases sin FTS5 (o anteriores al índice) siguen buscando con LIKE
+        self._use_fts = bool(self.db) and self.db.fetch_scalar(
+            "SELECT 1 FROM sqlite_master WHERE name = 'Clientes_fts'"
+        ) is not None
+        
+        # Búsqueda diferida: solo se consulta tras una pausa al escribir
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(250)
+        self._search_timer.timeout.connect(self._do_search)
         
         self.setup_ui()
         self.load_clients()
@@ -379,24 +497,7 @@ class ClientsFrame(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Buscar por nombre, apellido, DNI, teléfono...")
         self.search_input.setMinimumHeight(36)
-        self.search_input.setStyleSheet("""
-            QLineEdit {
-                background: white;
-                border: 1.5px solid #E2E8F0;
-                border-radius: 8px;
-                padding: 8px 12px;
-                font-family: 'Segoe UI';
-                font-size: 13px;
-                color: #1E293B;
-            }
-            QLineEdit:focus {
-                border-color: #3B82F6;
-                background: #F8FAFF;
-            }
-            QLineEdit::placeholder {
-                color: #9CA3AF;
-            }
-        """)
+        self.search_input.setStyleSheet(_INPUT_QSS)
         
         # Filtro
         filter_label = QLabel("Filtrar:")
@@ -465,7 +566,9 @@ class ClientsFrame(QWidget):
         layout.addWidget(table_title)
         
         # Tabla
-        self.clients_table = ModernTableWidget()
+        self.clients_model = ClientsTableModel(self)
+        self.clients_table = ModernTableView()
+        self.clients_table.setModel(self.clients_model)
         self.setup_table()
         layout.addWidget(self.clients_table, 1)
         
@@ -476,10 +579,6 @@ class ClientsFrame(QWidget):
 
     def setup_table(self):
         """Configura la tabla de clientes"""
-        headers = ["ID", "Nombre", "Apellido", "DNI", "Teléfono", "Email", "Estado"]
-        self.clients_table.setColumnCount(len(headers))
-        self.clients_table.setHorizontalHeaderLabels(headers)
-        
         # Configurar anchos de columnas
         self.clients_table.setColumnWidth(0, 60)   # ID
         self.clients_table.setColumnWidth(1, 120)  # Nombre
@@ -494,24 +593,7 @@ class ClientsFrame(QWidget):
         input_field = QLineEdit()
         input_field.setPlaceholderText(placeholder)
         input_field.setMinimumHeight(38)
-        input_field.setStyleSheet("""
-            QLineEdit {
-                background: white;
-                border: 1.5px solid #E2E8F0;
-                border-radius: 8px;
-                padding: 8px 12px;
-                font-family: 'Segoe UI';
-                font-size: 13px;
-                color: #1E293B;
-            }
-            QLineEdit:focus {
-                border-color: #3B82F6;
-                background: #F8FAFF;
-            }
-            QLineEdit::placeholder {
-                color: #9CA3AF;
-            }
-        """)
+        input_field.setStyleSheet(_INPUT_QSS)
         return input_field
 
     def load_clients(self):
@@ -523,11 +605,11 @@ class ClientsFrame(QWidget):
             # Determinar filtro
             filter_text = self.filter_combo.currentText()
             if filter_text == "Solo activos":
-                query = "SELECT * FROM Clientes WHERE activo = 1 ORDER BY apellido, nombre"
+                query = f"SELECT {_CLIENT_COLS} FROM Clientes WHERE activo = 1 ORDER BY apellido, nombre"
             elif filter_text == "Solo inactivos":
-                query = "SELECT * FROM Clientes WHERE activo = 0 ORDER BY apellido, nombre"
+                query = f"SELECT {_CLIENT_COLS} FROM Clientes WHERE activo = 0 ORDER BY apellido, nombre"
             else:
-                query = "SELECT * FROM Clientes ORDER BY apellido, nombre"
+                query = f"SELECT {_CLIENT_COLS} FROM Clientes ORDER BY apellido, nombre"
             
             clientes = self.db.fetch(query)
             self.populate_table(clientes)
@@ -537,39 +619,14 @@ class ClientsFrame(QWidget):
 
     def populate_table(self, clientes):
         """Llena la tabla con los datos de clientes"""
-        self.clients_table.setRowCount(0)
-        
-        for cliente in clientes:
-            (id_cliente, nombre, apellido, dni, telefono, email, direccion, 
-             fecha_registro, activo) = cliente
-            
-            row = self.clients_table.rowCount()
-            self.clients_table.insertRow(row)
-            
-            estado = "Activo" if activo else "Inactivo"
-            
-            # Crear items
-            items = [
-                QTableWidgetItem(str(id_cliente)),
-                QTableWidgetItem(nombre),
-                QTableWidgetItem(apellido),
-                QTableWidgetItem(dni or "N/A"),
-                QTableWidgetItem(telefono or "N/A"),
-                QTableWidgetItem(email or "N/A"),
-                QTableWidgetItem(estado)
-            ]
-            
-            # Aplicar estilo según estado
-            if not activo:
-                for item in items:
-                    item.setForeground(QColor("#94A3B8"))  # Color gris para inactivos
-            
-            # Añadir items a la tabla
-            for col, item in enumerate(items):
-                self.clients_table.setItem(row, col, item)
+        self.clients_model.set_rows(clientes)
 
     def search_clients(self):
-        """Busca clientes en tiempo real"""
+        """Reinicia la espera de la búsqueda con cada tecla"""
+        self._search_timer.start()
+
+    def _do_search(self):
+        """Busca clientes con el texto actual del buscador"""
         search_term = self.search_input.text().strip().lower()
         
         if not search_term:
@@ -577,21 +634,32 @@ class ClientsFrame(QWidget):
             return
             
         try:
-            query = """
-                SELECT * FROM Clientes 
-                WHERE LOWER(nombre) LIKE ? 
-                OR LOWER(apellido) LIKE ? 
-                OR LOWER(dni) LIKE ? 
-                OR LOWER(telefono) LIKE ? 
-                OR LOWER(email) LIKE ?
-                ORDER BY apellido, nombre
-            """
-            search_pattern = f"%{search_term}%"
-            clientes = self.db.fetch(
-                query,
-                (search_pattern, search_pattern, search_pattern, 
-                 search_pattern, search_pattern)
-            )
+            if self._use_fts:
+                clientes = self.db.fetch(
+                    f"""
+                    SELECT {_CLIENT_COLS_C} FROM Clientes_fts f
+                    JOIN Clientes c ON c.id = f.rowid
+                    WHERE Clientes_fts MATCH ?
+                    ORDER BY c.apellido, c.nombre
+                    """,
+                    (_fts_query(search_term),)
+                )
+            else:
+                query = f"""
+                    SELECT {_CLIENT_COLS} FROM Clientes
+                    WHERE LOWER(nombre) LIKE ? 
+                    OR LOWER(apellido) LIKE ? 
+                    OR LOWER(dni) LIKE ? 
+                    OR LOWER(telefono) LIKE ? 
+                    OR LOWER(email) LIKE ?
+                    ORDER BY apellido, nombre
+                """
+                search_pattern = f"%{search_term}%"
+                clientes = self.db.fetch(
+                    query,
+                    (search_pattern, search_pattern, search_pattern, 
+                     search_pattern, search_pattern)
+                )
             
             self.populate_table(clientes)
             
@@ -600,14 +668,13 @@ class ClientsFrame(QWidget):
 
     def on_double_click(self, index):
         """Maneja el doble click en la tabla"""
-        row = index.row()
-        client_id = int(self.clients_table.item(row, 0).text())
+        client_id = self.clients_model.row_at(index.row())[0]
         self.load_client_details(client_id)
 
     def load_client_details(self, client_id):
         """Carga los detalles de un cliente en el formulario"""
         try:
-            cliente = self.db.fetch("SELECT * FROM Clientes WHERE id = ?", (client_id,))
+            cliente = self.db.fetch(f"SELECT {_CLIENT_COLS} FROM Clientes WHERE id = ?", (client_id,))
             if cliente:
                 cliente_data = cliente[0]
                 (id_cliente, nombre, apellido, dni, telefono, email, 
@@ -645,13 +712,13 @@ class ClientsFrame(QWidget):
             return False
             
         # Validar email si se proporciona
-        if email and not re.match(r"^[^@]+@[^@]+\.[^@]+$", email):
+        if email and not _EMAIL_RE.match(email):
             self.show_error("Error de Validación", "Formato de email inválido")
             self.email_input.setFocus()
             return False
             
         # Validar DNI si se proporciona
-        if dni and not re.match(r"^[0-9]{13}$", dni):
+        if dni and not _DNI_RE.match(dni):
             self.show_error("Error de Validación", "El DNI debe tener 13 dígitos")
             self.dni_input.setFocus()
             return False
@@ -674,26 +741,16 @@ class ClientsFrame(QWidget):
             
             if self.current_client_id:
                 # Actualizar cliente existente
-                query = """
-                    UPDATE Clientes 
-                    SET nombre=?, apellido=?, dni=?, telefono=?, email=?, direccion=?, activo=?
-                    WHERE id=?
-                """
                 self.db.execute(
-                    query,
+                    SQL_UPDATE_CLIENT,
                     (nombre, apellido, dni, telefono, email, direccion, activo, self.current_client_id)
                 )
                 self.show_success("Cliente Actualizado", "Cliente actualizado correctamente")
             else:
                 # Crear nuevo cliente
-                fecha_registro = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                query = """
-                    INSERT INTO Clientes (nombre, apellido, dni, telefono, email, direccion, fecha_registro, activo)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """
                 self.db.execute(
-                    query,
-                    (nombre, apellido, dni, telefono, email, direccion, fecha_registro, activo)
+                    SQL_INSERT_CLIENT,
+                    (nombre, apellido, dni, telefono, email, direccion, activo)
                 )
                 self.show_success("Cliente Registrado", "Cliente registrado correctamente")
             
@@ -751,18 +808,20 @@ class ClientsFrame(QWidget):
                     )
                     
                     if reply2 == QMessageBox.Yes:
-                        self.db.execute(
-                            "DELETE FROM DetalleVenta WHERE venta_id IN (SELECT id FROM Ventas WHERE id_cliente = ?)",
-                            (self.current_client_id,)
-                        )
-                        self.db.execute(
-                            "DELETE FROM Ventas WHERE id_cliente = ?",
-                            (self.current_client_id,)
-                        )
-                        self.db.execute(
-                            "DELETE FROM Clientes WHERE id = ?",
-                            (self.current_client_id,)
-                        )
+                        # Un solo commit: se borra todo o no se borra nada
+                        with self.db.transaction():
+                            self.db.execute(
+                                "DELETE FROM DetalleVenta WHERE venta_id IN (SELECT id FROM Ventas WHERE id_cliente = ?)",
+                                (self.current_client_id,)
+                            )
+                            self.db.execute(
+                                "DELETE FROM Ventas WHERE id_cliente = ?",
+                                (self.current_client_id,)
+                            )
+                            self.db.execute(
+                                "DELETE FROM Clientes WHERE id = ?",
+                                (self.current_client_id,)
+                            )
                         self.show_success("Cliente Eliminado", "Cliente y ventas asociadas eliminados")
             else:
                 # Cliente sin ventas
@@ -799,16 +858,46 @@ class ClientsFrame(QWidget):
         self.clients_table.clearSelection()
 
     def export_to_csv(self):
-        """Exporta la lista de clientes a CSV"""
-        # Implementación simplificada - en producción usar filedialog
+        """Exporta la lista de clientes a CSV.
+
+        Las filas pasan del cursor al archivo por bloques, sin cargar la
+        tabla completa en memoria.
+        """
         try:
-            clientes = self.db.fetch(
-                "SELECT * FROM Clientes ORDER BY apellido, nombre"
+            filename, _ = QFileDialog.getSaveFileName(
+                self, "Exportar Clientes",
+                f"clientes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                "CSV Files (*.csv)"
             )
             
-            # Aquí iría la lógica para guardar el archivo
-            self.show_info("Exportar CSV", 
-                          f"Preparado para exportar {len(clientes)} clientes a CSV")
+            if not filename:
+                return
+            
+            # Cursor propio: el compartido de DBManager puede reutilizarse mientras tanto
+            cur = self.db.conn.execute(f"""
+                SELECT {_CLIENT_COLS}
+                FROM Clientes
+                ORDER BY apellido, nombre
+            """)
+            total = 0
+            try:
+                with open(filename, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+                    writer = csv.writer(csvfile)
+                    writer.writerow([
+                        'ID', 'Nombre', 'Apellido', 'DNI', 'Teléfono', 'Email',
+                        'Dirección', 'Fecha Registro', 'Activo'
+                    ])
+                    while True:
+                        rows = cur.fetchmany(EXPORT_CHUNK_ROWS)
+                        if not rows:
+                            break
+                        writer.writerows(rows)
+                        total += len(rows)
+            finally:
+                cur.close()
+            
+            self.show_success("Exportación Exitosa",
+                              f"{total} clientes exportados a:\n{filename}")
             
         except Exception as e:
             self.show_error("Error", f"Error al exportar: {e}")
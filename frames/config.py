@@ -5,20 +5,148 @@ Configuración global, empresa, facturación, seguridad, backup, y más.
 """
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame,
-    QLineEdit, QTextEdit, QTableWidget, QTableWidgetItem, QComboBox,
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QLineEdit, QTextEdit, QTableView, QComboBox,
     QSpinBox, QDoubleSpinBox, QCheckBox, QGroupBox, QTabWidget,
     QFormLayout, QMessageBox, QFileDialog, QScrollArea, QSplitter,
-    QProgressBar, QListWidget, QListWidgetItem, QInputDialog
+    QProgressBar, QListView, QDialog, QTextBrowser
 )
-from PySide6.QtCore import Qt, QTimer, QSettings
-from PySide6.QtGui import QFont, QColor, QPalette, QIcon
-import json
+from PySide6.QtCore import (
+    Qt, QTimer, QAbstractTableModel, QModelIndex,
+    QObject, QRunnable, QThreadPool, Signal, QStringListModel
+)
+from PySide6.QtGui import QFont
 import os
-import shutil
+import re
+import logging
+from contextlib import contextmanager
 from datetime import datetime
 import sqlite3
 
+from frames.erp_style import ERPStyle
+from frames.config_styles import (
+    GLOBAL_QSS, GROUP_QSS, PRIMARY_BTN_QSS, SECONDARY_BTN_QSS, DANGER_BTN_QSS,
+    COMBO_QSS, SPINBOX_QSS, TABLE_QSS
+)
+
+logger = logging.getLogger(__name__)
+
+# Páginas copiadas por paso de sqlite3.Connection.backup()
+BACKUP_PAGES = 2048
+
+# Sentencias SQL del módulo: texto fijo para que el cache de sentencias
+# de sqlite3 reutilice la sentencia preparada en cada llamada
+SQL_COUNT_DISCOUNTS = "SELECT COUNT(*) FROM Descuentos"
+# porcentaje se guarda como fracción (0-1); se muestra en % calculado por SQLite
+SQL_SELECT_DISCOUNTS = ("SELECT id, nombre, tipo, ROUND(porcentaje * 100, 2) AS pct "
+                        "FROM Descuentos ORDER BY id LIMIT ? OFFSET ?")
+SQL_INSERT_DISCOUNT = "INSERT INTO Descuentos (nombre, tipo, porcentaje) VALUES (?, ?, ?)"
+SQL_UPDATE_DISCOUNT = "UPDATE Descuentos SET nombre=?, tipo=?, porcentaje=? WHERE id=?"
+SQL_DELETE_DISCOUNT = "DELETE FROM Descuentos WHERE id = ?"
+
+# Variables {{nombre}} de las plantillas de recibo
+_TEMPLATE_RE = re.compile(r"\{\{(\w+)\}\}")
+
+# Plantilla de recibo por defecto, una sola cadena compartida
+_DEFAULT_RECEIPT_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>Recibo {{numero_factura}}</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        .header { text-align: center; margin-bottom: 20px; }
+        .info { margin-bottom: 15px; }
+        .items { width: 100%; border-collapse: collapse; margin: 15px 0; }
+        .items th, .items td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        .total { text-align: right; font-weight: bold; margin-top: 15px; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h2>{{empresa_nombre}}</h2>
+        <p>RUC: {{empresa_ruc}}</p>
+        <p>{{empresa_direccion}}</p>
+    </div>
+    
+    <div class="info">
+        <p><strong>Factura:</strong> {{numero_factura}}</p>
+        <p><strong>Fecha:</strong> {{fecha}}</p>
+        <p><strong>Cliente:</strong> {{cliente_nombre}}</p>
+    </div>
+    
+    <table class="items">
+        <thead>
+            <tr>
+                <th>Producto</th>
+                <th>Cantidad</th>
+                <th>Precio</th>
+                <th>Total</th>
+            </tr>
+        </thead>
+        <tbody>
+            {{items}}
+        </tbody>
+    </table>
+    
+    <div class="total">
+        <p>Subtotal: ${{subtotal}}</p>
+        <p>IVA: ${{iva}}</p>
+        <p><strong>Total: ${{total}}</strong></p>
+    </div>
+</body>
+</html>"""
+
+# Opciones fijas de los QComboBox, construidas una sola vez
+_COMBO_ITEMS = {
+    'currency': ("USD - Dólar Americano", "EUR - Euro", "MXN - Peso Mexicano",
+                 "COP - Peso Colombiano", "PEN - Sol Peruano"),
+    'language': ("Español", "English", "Português"),
+    'timezone': ("America/Mexico_City", "America/Bogota", "America/Lima",
+                 "America/New_York", "UTC"),
+    'discount_type': ("General", "Volumen", "Cliente Frecuente", "Temporada", "Producto"),
+    'backup_interval': ("Diario", "Semanal", "Mensual"),
+    'backup_hours': tuple(f"{h:02d}:00" for h in range(24)),
+}
+
+TAB_NAMES = (
+    "Empresa", "Facturación", "Descuentos", "Recibos",
+    "Seguridad", "Backup", "Sistema",
+)
+
+def compile_receipt_template(template):
+    """Divide la plantilla una sola vez: texto literal en las posiciones
+    pares, nombres de variable en las impares."""
+    return tuple(_TEMPLATE_RE.split(template))
+
+def render_compiled_template(segments, context):
+    """Une los segmentos de compile_receipt_template sin volver a escanear.
+
+    Las variables sin valor en context se dejan tal cual.
+    """
+    return "".join(
+        str(context.get(seg, "{{%s}}" % seg)) if i & 1 else seg
+        for i, seg in enumerate(segments)
+    )
+
+def render_receipt_template(template, context):
+    """Sustituye las variables {{nombre}} de la plantilla"""
+    return render_compiled_template(compile_receipt_template(template), context)
+
+# Segmentos de la plantilla por defecto, compilados al importar el módulo
+_DEFAULT_SEGMENTS = compile_receipt_template(_DEFAULT_RECEIPT_TEMPLATE)
+
+@contextmanager
+def _silent(root):
+    """Bloquea las señales de root y de todos sus widgets hijos durante una carga masiva"""
+    widgets = [root] + root.findChildren(QWidget)
+    previous = [(w, w.blockSignals(True)) for w in widgets]
+    try:
+        yield
+    finally:
+        for w, old in previous:
+            w.blockSignals(old)
+
 class AnimatedButton(QPushButton):
     """Botón con animaciones suaves al estilo Windows 11"""
     
@@ -27,21 +155,266 @@ class AnimatedButton(QPushButton):
         self.setCursor(Qt.PointingHandCursor)
         self.setMinimumHeight(36)
 
+class DiscountModel(QAbstractTableModel):
+    """Modelo de solo lectura para la tabla de descuentos"""
+
+    HEADERS = ("ID", "Nombre", "Tipo", "Porcentaje (%)")
+    PAGE_SIZE = 100
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self._rows = []
+        self._total = 0
+
+    def set_first_page(self, total, rows):
+        """Reinicia el modelo con el total de descuentos y su primera página"""
+        self.beginResetModel()
+        self._total = total
+        # Lista de tuplas de fetchall() tal cual; el texto se genera en data()
+        self._rows = rows
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._rows) < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Trae la siguiente página al hacer scroll"""
+        if parent.isValid():
+            return
+        start = len(self._rows)
+        page = self.db.fetch(SQL_SELECT_DISCOUNTS, (self.PAGE_SIZE, start))
+        if not page:
+            # La tabla encogió desde el COUNT: dejar de pedir páginas
+            self._total = start
+            return
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    def row_at(self, row):
+        return self._rows[row]
+
+    def _find(self, discount_id):
+        for row, values in enumerate(self._rows):
+            if values[0] == discount_id:
+                return row
+        return -1
+
+    def insert_row(self, values):
+        """Registra un descuento nuevo sin releer la tabla.
+
+        Los ids crecen, así que la fila va al final: se muestra ya si
+        todas las páginas están cargadas, o llega con el próximo fetchMore.
+        """
+        self._total += 1
+        start = len(self._rows)
+        if start == self._total - 1:
+            self.beginInsertRows(QModelIndex(), start, start)
+            self._rows.append(values)
+            self.endInsertRows()
+
+    def update_row(self, values):
+        """Reemplaza en sitio la fila con el mismo id, si ya está cargada"""
+        row = self._find(values[0])
+        if row >= 0:
+            self._rows[row] = values
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+    def remove_row(self, discount_id):
+        """Quita la fila del id dado sin releer la tabla"""
+        self._total -= 1
+        row = self._find(discount_id)
+        if row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[row]
+            self.endRemoveRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        # Conversión perezosa: solo para las celdas visibles que pinta la vista
+        value = self._rows[index.row()][index.column()]
+        return value if isinstance(value, str) else str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+class BackupSignals(QObject):
+    """Señales de un BackupJob, entregadas en el hilo de la interfaz"""
+    progress = Signal(int)
+    done = Signal(str)
+    failed = Signal(str)
+
+class DBSignals(QObject):
+    """Señales de un DBJob, entregadas en el hilo de la interfaz"""
+    done = Signal(object)
+    failed = Signal(str)
+
+class DBJob(QRunnable):
+    """Ejecuta fn(conn, *args) con una conexión propia, fuera del hilo de la interfaz.
+
+    La conexión de DBManager pertenece al hilo que la creó, por eso cada
+    trabajo abre la suya sobre el mismo archivo y la cierra al terminar.
+    """
+
+    def __init__(self, db_path, fn, *args):
+        super().__init__()
+        self.db_path = db_path
+        self.fn = fn
+        self.args = args
+        self.signals = DBSignals()
+
+    def run(self):
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                conn.execute("PRAGMA synchronous=NORMAL")
+                with conn:
+                    result = self.fn(conn, *self.args)
+            finally:
+                conn.close()
+            self.signals.done.emit(result)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+def _fetch_discounts_first_page(conn):
+    total = conn.execute(SQL_COUNT_DISCOUNTS).fetchone()[0]
+    rows = conn.execute(SQL_SELECT_DISCOUNTS, (DiscountModel.PAGE_SIZE, 0)).fetchall()
+    return total, rows
+
+def _execute(conn, query, params=()):
+    """Ejecuta query y devuelve el id de la última fila insertada"""
+    return conn.execute(query, params).lastrowid
+
+class BackupJob(QRunnable):
+    """Copia una base SQLite con la API de backup en línea, fuera del hilo de la interfaz.
+
+    Las rutas terminadas en .gz se descomprimen (origen) o comprimen (destino)
+    con gzip nivel 1.
+    """
+
+    def __init__(self, src_path, dst_path):
+        super().__init__()
+        self.src_path = src_path
+        self.dst_path = dst_path
+        self.signals = BackupSignals()
+
+    def run(self):
+        import gzip
+        import shutil
+        
+        temp_paths = []
+        try:
+            src_path = self.src_path
+            if src_path.endswith(".gz"):
+                src_path = self._temp_path(temp_paths)
+                with gzip.open(self.src_path, "rb") as fin, open(src_path, "wb") as fout:
+                    shutil.copyfileobj(fin, fout)
+            
+            dst_path = self._temp_path(temp_paths) if self.dst_path.endswith(".gz") else self.dst_path
+            src = sqlite3.connect(src_path)
+            dst = sqlite3.connect(dst_path)
+            try:
+                src.backup(dst, pages=BACKUP_PAGES, progress=self._on_progress)
+                # La base usa WAL: volcar el log al archivo para que la
+                # copia quede completa en un solo .db
+                dst.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                dst.close()
+                src.close()
+            
+            if dst_path != self.dst_path:
+                with open(dst_path, "rb") as fin, gzip.open(self.dst_path, "wb", compresslevel=1) as fout:
+                    shutil.copyfileobj(fin, fout)
+            
+            self.signals.done.emit(self.dst_path)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        finally:
+            for path in temp_paths:
+                os.remove(path)
+
+    def _on_progress(self, status, remaining, total):
+        if total:
+            self.signals.progress.emit(int(100 * (total - remaining) / total))
+
+    @staticmethod
+    def _temp_path(temp_paths):
+        import tempfile
+        
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        temp_paths.append(path)
+        return path
+
 class ConfigFrame(QWidget):
     """Sistema de Configuración Profesional ERP - Windows 11 Style"""
 
+    # Fuentes compartidas; se crean en el primer uso porque QFont
+    # requiere una QApplication existente
+    _FONTS = None
+
+    # Clave de Configuracion -> atributo QLineEdit que la edita; la misma
+    # tabla carga (apply_settings_to_ui) y guarda (_bind) los campos
+    FIELD_MAP = {
+        'empresa_nombre': 'company_name',
+        'empresa_ruc': 'company_ruc',
+        'empresa_telefono': 'company_phone',
+        'empresa_email': 'company_email',
+    }
+
+    @classmethod
+    def _fonts(cls):
+        if cls._FONTS is None:
+            cls._FONTS = {
+                'title': QFont("Segoe UI", 20, QFont.Bold),
+                'subtitle': QFont("Segoe UI", 11),
+                'section': QFont("Segoe UI", 14, QFont.Bold),
+            }
+        return cls._FONTS
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.app = parent
         self.db = parent.db if parent and hasattr(parent, 'db') else None
-        self.current_settings = {}
+        # Valores editados aún sin guardar (clave -> valor); lo ya guardado
+        # se lee de la cache de DBManager con get_config()
+        self._settings_dirty = {}
+        # Último valor emitido por cada control editado, por clave
+        self._vals = {}
+        self._settings_loaded = False
         self.backup_timer = QTimer()
+        self._backup_job = None
+        # (texto, segmentos) de la última plantilla compilada
+        self._compiled_template = (_DEFAULT_RECEIPT_TEMPLATE, _DEFAULT_SEGMENTS)
+        # Trabajos de base de datos en curso (referencia viva hasta terminar)
+        self._db_jobs = set()
+        db_name = getattr(self.db, 'db_name', None)
+        self.backup_dir = os.path.dirname(os.path.abspath(db_name)) if db_name else os.getcwd()
+        
+        # Guardado automático diferido tras la última edición
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(500)
+        self._save_timer.timeout.connect(self._autosave_settings)
         
         self.setup_ui()
         self.load_all_settings()
 
     def setup_ui(self):
         """Configura la interfaz de usuario moderna"""
+        # Una sola hoja para todo el frame; los controles se seleccionan por objectName
+        self.setStyleSheet(GLOBAL_QSS)
+
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(24, 24, 24, 24)
         main_layout.setSpacing(20)
@@ -50,11 +423,11 @@ class ConfigFrame(QWidget):
         header_layout = QHBoxLayout()
         
         title = QLabel("⚙️ Configuración del Sistema ERP")
-        title.setFont(QFont("Segoe UI", 20, QFont.Bold))
+        title.setFont(self._fonts()['title'])
         title.setStyleSheet("color: #1E293B;")
         
         subtitle = QLabel("Configuración global y parámetros del sistema")
-        subtitle.setFont(QFont("Segoe UI", 11))
+        subtitle.setFont(self._fonts()['subtitle'])
         subtitle.setStyleSheet("color: #64748B;")
         
         title_layout = QVBoxLayout()
@@ -69,37 +442,11 @@ class ConfigFrame(QWidget):
         action_layout.setSpacing(8)
         
         self.save_btn = AnimatedButton("💾 Guardar Todo")
-        self.save_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #10B981, stop:1 #34D399);
-                border: none;
-                border-radius: 8px;
-                color: white;
-                font-weight: 600;
-                padding: 10px 20px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #059669, stop:1 #10B981);
-            }
-        """)
+        self.save_btn.setObjectName("erpSuccessBtn")
         self.save_btn.clicked.connect(self.save_all_settings)
         
         self.reset_btn = AnimatedButton("🔄 Restablecer")
-        self.reset_btn.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                border: 1.5px solid #E2E8F0;
-                border-radius: 8px;
-                color: #475569;
-                font-weight: 500;
-                padding: 10px 20px;
-            }
-            QPushButton:hover {
-                background: #F1F5F9;
-            }
-        """)
+        self.reset_btn.setObjectName("erpSecondaryBtn")
         self.reset_btn.clicked.connect(self.reset_to_defaults)
         
         action_layout.addWidget(self.save_btn)
@@ -110,44 +457,47 @@ class ConfigFrame(QWidget):
 
         # Tabs principales
         self.tabs = QTabWidget()
-        self.tabs.setStyleSheet("""
-            QTabWidget::pane {
-                border: 1px solid #E2E8F0;
-                border-radius: 8px;
-                background: white;
-            }
-            QTabBar::tab {
-                background: #F8FAFC;
-                border: 1px solid #E2E8F0;
-                padding: 12px 20px;
-                margin-right: 2px;
-                border-top-left-radius: 6px;
-                border-top-right-radius: 6px;
-                font-weight: 500;
-            }
-            QTabBar::tab:selected {
-                background: white;
-                border-bottom: none;
-            }
-            QTabBar::tab:hover {
-                background: #F1F5F9;
-            }
-        """)
-        
-        # Crear todas las pestañas
-        self.create_company_tab()
-        self.create_invoicing_tab()
-        self.create_discounts_tab()
-        self.create_receipt_tab()
-        self.create_security_tab()
-        self.create_backup_tab()
-        self.create_system_tab()
+        self.tabs.setObjectName("erpTabs")
+        
+        # Pestañas vacías: el contenido se construye en la primera visita
+        self._tab_builders = {
+            0: self.create_company_tab,
+            1: self.create_invoicing_tab,
+            2: self.create_discounts_tab,
+            3: self.create_receipt_tab,
+            4: self.create_security_tab,
+            5: self.create_backup_tab,
+            6: self.create_system_tab,
+        }
+        # Carga de datos propia de cada pestaña, una vez construida
+        self._tab_loaders = {
+            0: self.apply_settings_to_ui,
+            2: self.load_discounts_list,
+            4: self.apply_security_settings,
+            5: self.load_backup_list,
+        }
+        self._built = [False] * len(TAB_NAMES)
+        for name in TAB_NAMES:
+            self.tabs.addTab(QWidget(), name)
+        
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        self._on_tab_changed(self.tabs.currentIndex())
         
         main_layout.addWidget(self.tabs)
 
-    def create_company_tab(self):
+    def _on_tab_changed(self, index):
+        """Construye la pestaña en su primera visita y carga sus datos"""
+        if index < 0 or self._built[index]:
+            return
+        self._tab_builders[index](self.tabs.widget(index))
+        self._built[index] = True
+        loader = self._tab_loaders.get(index)
+        if loader and self._settings_loaded:
+            with _silent(self.tabs.widget(index)):
+                loader()
+
+    def create_company_tab(self, widget):
         """Pestaña de configuración de empresa"""
-        widget = QWidget()
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(20, 20, 20, 20)
         
@@ -158,7 +508,7 @@ class ConfigFrame(QWidget):
         
         # Información de la Empresa
         company_group = QGroupBox("🏢 Información de la Empresa")
-        company_group.setStyleSheet(self.get_group_style())
+        company_group.setObjectName("erpGroup")
         company_layout = QFormLayout(company_group)
         
         self.company_name = self.create_styled_input("Nombre de la empresa")
@@ -166,6 +516,8 @@ class ConfigFrame(QWidget):
         self.company_address = self.create_styled_textedit("Dirección fiscal")
         self.company_phone = self.create_styled_input("Teléfono")
         self.company_email = self.create_styled_input("Email")
+        for clave, attr in self.FIELD_MAP.items():
+            self._bind(getattr(self, attr).textChanged, clave)
         self.company_website = self.create_styled_input("Sitio web")
         
         company_layout.addRow("Nombre Legal *:", self.company_name)
@@ -177,7 +529,7 @@ class ConfigFrame(QWidget):
         
         # Información de Contacto
         contact_group = QGroupBox("📞 Información de Contacto")
-        contact_group.setStyleSheet(self.get_group_style())
+        contact_group.setObjectName("erpGroup")
         contact_layout = QFormLayout(contact_group)
         
         self.contact_name = self.create_styled_input("Nombre del contacto principal")
@@ -190,22 +542,20 @@ class ConfigFrame(QWidget):
         
         # Configuración Regional
         regional_group = QGroupBox("🌍 Configuración Regional")
-        regional_group.setStyleSheet(self.get_group_style())
+        regional_group.setObjectName("erpGroup")
         regional_layout = QFormLayout(regional_group)
         
         self.currency = QComboBox()
-        self.currency.addItems(["USD - Dólar Americano", "EUR - Euro", "MXN - Peso Mexicano", 
-                               "COP - Peso Colombiano", "PEN - Sol Peruano"])
-        self.currency.setStyleSheet(self.get_combo_style())
+        self.currency.setObjectName("erpCombo")
+        self.currency.addItems(_COMBO_ITEMS['currency'])
         
         self.language = QComboBox()
-        self.language.addItems(["Español", "English", "Português"])
-        self.language.setStyleSheet(self.get_combo_style())
+        self.language.setObjectName("erpCombo")
+        self.language.addItems(_COMBO_ITEMS['language'])
         
         self.timezone = QComboBox()
-        self.timezone.addItems(["America/Mexico_City", "America/Bogota", "America/Lima", 
-                               "America/New_York", "UTC"])
-        self.timezone.setStyleSheet(self.get_combo_style())
+        self.timezone.setObjectName("erpCombo")
+        self.timezone.addItems(_COMBO_ITEMS['timezone'])
         
         regional_layout.addRow("Moneda:", self.currency)
         regional_layout.addRow("Idioma:", self.language)
@@ -218,12 +568,9 @@ class ConfigFrame(QWidget):
         
         scroll.setWidget(content)
         layout.addWidget(scroll)
-        
-        self.tabs.addTab(widget, "Empresa")
 
-    def create_invoicing_tab(self):
+    def create_invoicing_tab(self, widget):
         """Pestaña de configuración de facturación"""
-        widget = QWidget()
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(20, 20, 20, 20)
         
@@ -234,19 +581,19 @@ class ConfigFrame(QWidget):
         
         # Configuración de Facturación
         invoice_group = QGroupBox("🧾 Configuración de Facturación")
-        invoice_group.setStyleSheet(self.get_group_style())
+        invoice_group.setObjectName("erpGroup")
         invoice_layout = QFormLayout(invoice_group)
         
         self.invoice_series = self.create_styled_input("Serie de facturación")
         self.invoice_start = QSpinBox()
+        self.invoice_start.setObjectName("erpSpin")
         self.invoice_start.setRange(1, 999999)
-        self.invoice_start.setStyleSheet(self.get_spinbox_style())
         
         self.default_iva = QDoubleSpinBox()
+        self.default_iva.setObjectName("erpSpin")
         self.default_iva.setRange(0, 50)
         self.default_iva.setSuffix(" %")
         self.default_iva.setDecimals(2)
-        self.default_iva.setStyleSheet(self.get_spinbox_style())
         
         self.invoice_terms = self.create_styled_textedit("Términos y condiciones")
         
@@ -257,7 +604,7 @@ class ConfigFrame(QWidget):
         
         # Resoluciones DIAN/SAT
         resolution_group = QGroupBox("📄 Resoluciones Tributarias")
-        resolution_group.setStyleSheet(self.get_group_style())
+        resolution_group.setObjectName("erpGroup")
         resolution_layout = QFormLayout(resolution_group)
         
         self.resolution_number = self.create_styled_input("Número de resolución")
@@ -276,12 +623,9 @@ class ConfigFrame(QWidget):
         
         scroll.setWidget(content)
         layout.addWidget(scroll)
-        
-        self.tabs.addTab(widget, "Facturación")
 
-    def create_discounts_tab(self):
+    def create_discounts_tab(self, widget):
         """Pestaña de gestión de descuentos"""
-        widget = QWidget()
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(20, 20, 20, 20)
         
@@ -292,27 +636,27 @@ class ConfigFrame(QWidget):
         list_layout = QVBoxLayout(list_widget)
         
         list_header = QLabel("📋 Descuentos Configurados")
-        list_header.setFont(QFont("Segoe UI", 14, QFont.Bold))
+        list_header.setFont(self._fonts()['section'])
         list_header.setStyleSheet("color: #1E293B; margin-bottom: 10px;")
         list_layout.addWidget(list_header)
         
-        self.discounts_table = QTableWidget()
-        self.discounts_table.setColumnCount(4)
-        self.discounts_table.setHorizontalHeaderLabels(["ID", "Nombre", "Tipo", "Porcentaje"])
-        self.discounts_table.setStyleSheet(self.get_table_style())
+        self.discounts_model = DiscountModel(self.db, self)
+        self.discounts_table = QTableView()
+        self.discounts_table.setObjectName("erpTable")
+        self.discounts_table.setModel(self.discounts_model)
         self.discounts_table.horizontalHeader().setStretchLastSection(True)
-        self.discounts_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.discounts_table.setSelectionBehavior(QTableView.SelectRows)
         
         list_layout.addWidget(self.discounts_table)
         
         # Botones de acción
         btn_layout = QHBoxLayout()
         self.new_discount_btn = AnimatedButton("➕ Nuevo Descuento")
-        self.new_discount_btn.setStyleSheet(self.get_secondary_button_style())
+        self.new_discount_btn.setObjectName("erpSecondaryBtn")
         self.new_discount_btn.clicked.connect(self.reset_discount_form)
         
         self.delete_discount_btn = AnimatedButton("🗑️ Eliminar")
-        self.delete_discount_btn.setStyleSheet(self.get_danger_button_style())
+        self.delete_discount_btn.setObjectName("erpDangerBtn")
         self.delete_discount_btn.clicked.connect(self.delete_discount)
         
         btn_layout.addWidget(self.new_discount_btn)
@@ -326,7 +670,7 @@ class ConfigFrame(QWidget):
         form_layout = QVBoxLayout(form_widget)
         
         form_header = QLabel("📝 Configurar Descuento")
-        form_header.setFont(QFont("Segoe UI", 14, QFont.Bold))
+        form_header.setFont(self._fonts()['section'])
         form_header.setStyleSheet("color: #1E293B; margin-bottom: 20px;")
         form_layout.addWidget(form_header)
         
@@ -337,19 +681,19 @@ class ConfigFrame(QWidget):
         
         self.discount_name = self.create_styled_input("Nombre del descuento")
         self.discount_percentage = QDoubleSpinBox()
+        self.discount_percentage.setObjectName("erpSpin")
         self.discount_percentage.setRange(0, 100)
         self.discount_percentage.setSuffix(" %")
         self.discount_percentage.setDecimals(2)
-        self.discount_percentage.setStyleSheet(self.get_spinbox_style())
         
         self.discount_type = QComboBox()
-        self.discount_type.addItems(["General", "Volumen", "Cliente Frecuente", "Temporada", "Producto"])
-        self.discount_type.setStyleSheet(self.get_combo_style())
+        self.discount_type.setObjectName("erpCombo")
+        self.discount_type.addItems(_COMBO_ITEMS['discount_type'])
         
         self.discount_min_amount = QDoubleSpinBox()
+        self.discount_min_amount.setObjectName("erpSpin")
         self.discount_min_amount.setRange(0, 1000000)
         self.discount_min_amount.setPrefix("$ ")
-        self.discount_min_amount.setStyleSheet(self.get_spinbox_style())
         
         self.discount_active = QCheckBox("Descuento activo")
         self.discount_active.setChecked(True)
@@ -365,7 +709,7 @@ class ConfigFrame(QWidget):
         form_layout.addStretch()
         
         self.save_discount_btn = AnimatedButton("💾 Guardar Descuento")
-        self.save_discount_btn.setStyleSheet(self.get_primary_button_style())
+        self.save_discount_btn.setObjectName("erpPrimaryBtn")
         self.save_discount_btn.clicked.connect(self.save_discount)
         form_layout.addWidget(self.save_discount_btn)
         
@@ -374,11 +718,9 @@ class ConfigFrame(QWidget):
         splitter.setSizes([400, 300])
         
         layout.addWidget(splitter)
-        self.tabs.addTab(widget, "Descuentos")
 
-    def create_receipt_tab(self):
+    def create_receipt_tab(self, widget):
         """Pestaña de plantillas de recibos"""
-        widget = QWidget()
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(20, 20, 20, 20)
         
@@ -393,34 +735,22 @@ class ConfigFrame(QWidget):
         
         # Editor de plantilla
         self.receipt_template = QTextEdit()
-        self.receipt_template.setStyleSheet("""
-            QTextEdit {
-                background: white;
-                border: 1.5px solid #E2E8F0;
-                border-radius: 8px;
-                padding: 12px;
-                font-family: 'Courier New';
-                font-size: 12px;
-            }
-            QTextEdit:focus {
-                border-color: #3B82F6;
-            }
-        """)
+        self.receipt_template.setObjectName("erpTemplateEditor")
         layout.addWidget(self.receipt_template, 1)
         
         # Botones de acción
         btn_layout = QHBoxLayout()
         
         self.preview_btn = AnimatedButton("👁️ Vista Previa")
-        self.preview_btn.setStyleSheet(self.get_secondary_button_style())
+        self.preview_btn.setObjectName("erpSecondaryBtn")
         self.preview_btn.clicked.connect(self.preview_receipt)
         
         self.save_template_btn = AnimatedButton("💾 Guardar Plantilla")
-        self.save_template_btn.setStyleSheet(self.get_primary_button_style())
+        self.save_template_btn.setObjectName("erpPrimaryBtn")
         self.save_template_btn.clicked.connect(self.save_receipt_template)
         
         self.restore_template_btn = AnimatedButton("🔄 Restaurar Original")
-        self.restore_template_btn.setStyleSheet(self.get_secondary_button_style())
+        self.restore_template_btn.setObjectName("erpSecondaryBtn")
         self.restore_template_btn.clicked.connect(self.restore_default_template)
         
         btn_layout.addWidget(self.preview_btn)
@@ -429,11 +759,9 @@ class ConfigFrame(QWidget):
         btn_layout.addStretch()
         
         layout.addLayout(btn_layout)
-        self.tabs.addTab(widget, "Recibos")
 
-    def create_security_tab(self):
+    def create_security_tab(self, widget):
         """Pestaña de configuración de seguridad"""
-        widget = QWidget()
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(20, 20, 20, 20)
         
@@ -444,20 +772,20 @@ class ConfigFrame(QWidget):
         
         # Configuración de Contraseñas
         password_group = QGroupBox("🔐 Políticas de Contraseñas")
-        password_group.setStyleSheet(self.get_group_style())
+        password_group.setObjectName("erpGroup")
         password_layout = QFormLayout(password_group)
         
         self.min_password_length = QSpinBox()
+        self.min_password_length.setObjectName("erpSpin")
         self.min_password_length.setRange(4, 20)
-        self.min_password_length.setStyleSheet(self.get_spinbox_style())
         
         self.require_special_chars = QCheckBox("Requerir caracteres especiales")
         self.require_uppercase = QCheckBox("Requerir mayúsculas")
         self.require_numbers = QCheckBox("Requerir números")
         self.password_expiry = QSpinBox()
+        self.password_expiry.setObjectName("erpSpin")
         self.password_expiry.setRange(0, 365)
         self.password_expiry.setSuffix(" días (0 = nunca expira)")
-        self.password_expiry.setStyleSheet(self.get_spinbox_style())
         
         password_layout.addRow("Longitud Mínima:", self.min_password_length)
         password_layout.addRow("", self.require_special_chars)
@@ -467,22 +795,23 @@ class ConfigFrame(QWidget):
         
         # Configuración de Sesiones
         session_group = QGroupBox("💻 Configuración de Sesiones")
-        session_group.setStyleSheet(self.get_group_style())
+        session_group.setObjectName("erpGroup")
         session_layout = QFormLayout(session_group)
         
         self.session_timeout = QSpinBox()
+        self.session_timeout.setObjectName("erpSpin")
         self.session_timeout.setRange(5, 480)
         self.session_timeout.setSuffix(" minutos")
-        self.session_timeout.setStyleSheet(self.get_spinbox_style())
+        self._bind(self.session_timeout.valueChanged, 'session_timeout')
         
         self.max_login_attempts = QSpinBox()
+        self.max_login_attempts.setObjectName("erpSpin")
         self.max_login_attempts.setRange(1, 10)
-        self.max_login_attempts.setStyleSheet(self.get_spinbox_style())
         
         self.lockout_duration = QSpinBox()
+        self.lockout_duration.setObjectName("erpSpin")
         self.lockout_duration.setRange(1, 60)
         self.lockout_duration.setSuffix(" minutos")
-        self.lockout_duration.setStyleSheet(self.get_spinbox_style())
         
         session_layout.addRow("Tiempo de Espera:", self.session_timeout)
         session_layout.addRow("Intentos de Login:", self.max_login_attempts)
@@ -494,35 +823,32 @@ class ConfigFrame(QWidget):
         
         scroll.setWidget(content)
         layout.addWidget(scroll)
-        self.tabs.addTab(widget, "Seguridad")
 
-    def create_backup_tab(self):
+    def create_backup_tab(self, widget):
         """Pestaña de configuración de backup"""
-        widget = QWidget()
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(20, 20, 20, 20)
         
         # Configuración de Backup Automático
         auto_backup_group = QGroupBox("🛡️ Backup Automático")
-        auto_backup_group.setStyleSheet(self.get_group_style())
+        auto_backup_group.setObjectName("erpGroup")
         auto_backup_layout = QFormLayout(auto_backup_group)
         
         self.auto_backup_enabled = QCheckBox("Habilitar backup automático")
         self.auto_backup_enabled.setChecked(True)
         
         self.backup_interval = QComboBox()
-        self.backup_interval.addItems(["Diario", "Semanal", "Mensual"])
-        self.backup_interval.setStyleSheet(self.get_combo_style())
+        self.backup_interval.setObjectName("erpCombo")
+        self.backup_interval.addItems(_COMBO_ITEMS['backup_interval'])
         
         self.backup_time = QComboBox()
-        times = [f"{h:02d}:00" for h in range(24)]
-        self.backup_time.addItems(times)
-        self.backup_time.setStyleSheet(self.get_combo_style())
+        self.backup_time.setObjectName("erpCombo")
+        self.backup_time.addItems(_COMBO_ITEMS['backup_hours'])
         
         self.backup_retention = QSpinBox()
+        self.backup_retention.setObjectName("erpSpin")
         self.backup_retention.setRange(1, 365)
         self.backup_retention.setSuffix(" días")
-        self.backup_retention.setStyleSheet(self.get_spinbox_style())
         
         auto_backup_layout.addRow("", self.auto_backup_enabled)
         auto_backup_layout.addRow("Frecuencia:", self.backup_interval)
@@ -531,16 +857,16 @@ class ConfigFrame(QWidget):
         
         # Backup Manual
         manual_backup_group = QGroupBox("💾 Backup Manual")
-        manual_backup_group.setStyleSheet(self.get_group_style())
+        manual_backup_group.setObjectName("erpGroup")
         manual_backup_layout = QVBoxLayout(manual_backup_group)
         
         backup_btn_layout = QHBoxLayout()
         self.backup_now_btn = AnimatedButton("📦 Crear Backup Ahora")
-        self.backup_now_btn.setStyleSheet(self.get_primary_button_style())
+        self.backup_now_btn.setObjectName("erpPrimaryBtn")
         self.backup_now_btn.clicked.connect(self.create_backup)
         
         self.restore_btn = AnimatedButton("🔄 Restaurar Backup")
-        self.restore_btn.setStyleSheet(self.get_secondary_button_style())
+        self.restore_btn.setObjectName("erpSecondaryBtn")
         self.restore_btn.clicked.connect(self.restore_backup)
         
         backup_btn_layout.addWidget(self.backup_now_btn)
@@ -549,26 +875,25 @@ class ConfigFrame(QWidget):
         
         manual_backup_layout.addLayout(backup_btn_layout)
         
+        self.backup_progress = QProgressBar()
+        self.backup_progress.setRange(0, 100)
+        self.backup_progress.setVisible(False)
+        manual_backup_layout.addWidget(self.backup_progress)
+        
         # Lista de backups
-        self.backup_list = QListWidget()
-        self.backup_list.setStyleSheet("""
-            QListWidget {
-                background: white;
-                border: 1px solid #E2E8F0;
-                border-radius: 6px;
-            }
-        """)
+        self.backup_model = QStringListModel(self)
+        self.backup_list = QListView()
+        self.backup_list.setModel(self.backup_model)
+        self.backup_list.setUniformItemSizes(True)
+        self.backup_list.setObjectName("erpBackupList")
         manual_backup_layout.addWidget(self.backup_list)
         
         layout.addWidget(auto_backup_group)
         layout.addWidget(manual_backup_group)
         layout.addStretch()
-        
-        self.tabs.addTab(widget, "Backup")
 
-    def create_system_tab(self):
+    def create_system_tab(self, widget):
         """Pestaña de configuración del sistema"""
-        widget = QWidget()
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(20, 20, 20, 20)
         
@@ -579,21 +904,21 @@ class ConfigFrame(QWidget):
         
         # Configuración de Rendimiento
         performance_group = QGroupBox("🚀 Configuración de Rendimiento")
-        performance_group.setStyleSheet(self.get_group_style())
+        performance_group.setObjectName("erpGroup")
         performance_layout = QFormLayout(performance_group)
         
         self.cache_size = QSpinBox()
+        self.cache_size.setObjectName("erpSpin")
         self.cache_size.setRange(10, 1000)
         self.cache_size.setSuffix(" MB")
-        self.cache_size.setStyleSheet(self.get_spinbox_style())
         
         self.auto_refresh = QCheckBox("Actualización automática de datos")
         self.auto_refresh.setChecked(True)
         
         self.refresh_interval = QSpinBox()
+        self.refresh_interval.setObjectName("erpSpin")
         self.refresh_interval.setRange(1, 60)
         self.refresh_interval.setSuffix(" segundos")
-        self.refresh_interval.setStyleSheet(self.get_spinbox_style())
         
         performance_layout.addRow("Tamaño de Cache:", self.cache_size)
         performance_layout.addRow("", self.auto_refresh)
@@ -601,15 +926,15 @@ class ConfigFrame(QWidget):
         
         # Configuración de Base de Datos
         database_group = QGroupBox("🗄️ Configuración de Base de Datos")
-        database_group.setStyleSheet(self.get_group_style())
+        database_group.setObjectName("erpGroup")
         database_layout = QFormLayout(database_group)
         
         self.db_optimize = QCheckBox("Optimizar base de datos al iniciar")
         self.db_clean_logs = QCheckBox("Limpiar logs antiguos automáticamente")
         self.log_retention = QSpinBox()
+        self.log_retention.setObjectName("erpSpin")
         self.log_retention.setRange(1, 365)
         self.log_retention.setSuffix(" días")
-        self.log_retention.setStyleSheet(self.get_spinbox_style())
         
         database_layout.addRow("", self.db_optimize)
         database_layout.addRow("", self.db_clean_logs)
@@ -621,224 +946,165 @@ class ConfigFrame(QWidget):
         
         scroll.setWidget(content)
         layout.addWidget(scroll)
-        self.tabs.addTab(widget, "Sistema")
 
     # Métodos de utilidad para estilos
     def get_group_style(self):
-        return """
-            QGroupBox {
-                font-weight: bold;
-                font-size: 14px;
-                color: #1E293B;
-                border: 1px solid #E2E8F0;
-                border-radius: 8px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """
+        return GROUP_QSS
     
     def get_primary_button_style(self):
-        return """
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #3B82F6, stop:1 #60A5FA);
-                border: none;
-                border-radius: 8px;
-                color: white;
-                font-weight: 600;
-                padding: 10px 20px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #2563EB, stop:1 #3B82F6);
-            }
-        """
+        return PRIMARY_BTN_QSS
     
     def get_secondary_button_style(self):
-        return """
-            QPushButton {
-                background: transparent;
-                border: 1.5px solid #E2E8F0;
-                border-radius: 8px;
-                color: #475569;
-                font-weight: 500;
-                padding: 10px 20px;
-            }
-            QPushButton:hover {
-                background: #F1F5F9;
-                border-color: #CBD5E1;
-            }
-        """
+        return SECONDARY_BTN_QSS
     
     def get_danger_button_style(self):
-        return """
-            QPushButton {
-                background: transparent;
-                border: 1.5px solid #FECACA;
-                border-radius: 8px;
-                color: #DC2626;
-                font-weight: 500;
-                padding: 10px 20px;
-            }
-            QPushButton:hover {
-                background: #FEF2F2;
-                border-color: #FCA5A5;
-            }
-        """
+        return DANGER_BTN_QSS
     
     def create_styled_input(self, placeholder):
         input_field = QLineEdit()
+        ERPStyle.setup_input(input_field)
         input_field.setPlaceholderText(placeholder)
         input_field.setMinimumHeight(38)
-        input_field.setStyleSheet("""
-            QLineEdit {
-                background: white;
-                border: 1.5px solid #E2E8F0;
-                border-radius: 8px;
-                padding: 8px 12px;
-                font-family: 'Segoe UI';
-                font-size: 13px;
-                color: #1E293B;
-            }
-            QLineEdit:focus {
-                border-color: #3B82F6;
-                background: #F8FAFF;
-            }
-        """)
         return input_field
     
     def create_styled_textedit(self, placeholder):
         textedit = QTextEdit()
+        textedit.setObjectName("erpTextEdit")
         textedit.setPlaceholderText(placeholder)
         textedit.setMaximumHeight(80)
-        textedit.setStyleSheet("""
-            QTextEdit {
-                background: white;
-                border: 1.5px solid #E2E8F0;
-                border-radius: 8px;
-                padding: 8px 12px;
-                font-family: 'Segoe UI';
-                font-size: 13px;
-                color: #1E293B;
-            }
-            QTextEdit:focus {
-                border-color: #3B82F6;
-                background: #F8FAFF;
-            }
-        """)
         return textedit
     
     def get_combo_style(self):
-        return """
-            QComboBox {
-                background: white;
-                border: 1.5px solid #E2E8F0;
-                border-radius: 8px;
-                padding: 8px 12px;
-                font-family: 'Segoe UI';
-                font-size: 13px;
-                color: #1E293B;
-                min-height: 38px;
-            }
-            QComboBox:focus {
-                border-color: #3B82F6;
-            }
-        """
+        return COMBO_QSS
     
     def get_spinbox_style(self):
-        return """
-            QSpinBox, QDoubleSpinBox {
-                background: white;
-                border: 1.5px solid #E2E8F0;
-                border-radius: 8px;
-                padding: 8px 12px;
-                font-family: 'Segoe UI';
-                font-size: 13px;
-                color: #1E293B;
-                min-height: 38px;
-            }
-            QSpinBox:focus, QDoubleSpinBox:focus {
-                border-color: #3B82F6;
-            }
-        """
+        return SPINBOX_QSS
     
     def get_table_style(self):
-        return """
-            QTableWidget {
-                background: white;
-                border: 1px solid #E2E8F0;
-                border-radius: 8px;
-                gridline-color: #F1F5F9;
-            }
-            QTableWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #F1F5F9;
-            }
-            QHeaderView::section {
-                background: #F8FAFC;
-                padding: 12px 8px;
-                border: none;
-                border-bottom: 2px solid #E2E8F0;
-            }
-        """
+        return TABLE_QSS
 
     # Métodos de funcionalidad
-    def load_all_settings(self):
-        """Carga todas las configuraciones desde la base de datos"""
+    def _run_db(self, fn, *args, on_done, on_failed=None):
+        """Lanza fn(conn, *args) en el pool global; on_done recibe su resultado"""
+        job = DBJob(self.db.db_name, fn, *args)
+        
+        def finish(slot, value):
+            self._db_jobs.discard(job)
+            slot(value)
+        
+        job.signals.done.connect(lambda result: finish(on_done, result))
+        job.signals.failed.connect(
+            lambda error: finish(on_failed or self._on_db_failed, error)
+        )
+        self._db_jobs.add(job)
+        QThreadPool.globalInstance().start(job)
+
+    def _on_db_failed(self, error):
+        logger.warning("Error en operación de base de datos: %s", error)
+
+    def load_all_settings(self, refresh=False):
+        """Carga todas las configuraciones desde la base de datos.
+
+        Los valores salen de la cache de Configuracion de DBManager;
+        refresh=True la descarta antes (por ejemplo tras restaurar un backup).
+        """
+        if refresh:
+            self.db.invalidate_config_cache()
+        self._apply_loaded_settings()
+
+    def _apply_loaded_settings(self):
         try:
-            # Cargar configuración de empresa
-            settings = self.db.fetch("SELECT clave, valor FROM Configuracion")
-            for clave, valor in settings:
-                self.current_settings[clave] = valor
-            
-            # Aplicar configuraciones a los campos
-            self.apply_settings_to_ui()
+            self._settings_dirty.clear()
+            self._settings_loaded = True
             
-            # Cargar descuentos
-            self.load_discounts_list()
+            # Aplicar configuraciones solo a las pestañas ya construidas;
+            # el resto se llena al construirse en _on_tab_changed
+            with _silent(self):
+                for index, loader in self._tab_loaders.items():
+                    if self._built[index]:
+                        loader()
             
-        except Exception as e:
-            print(f"Error cargando configuraciones: {e}")
+        except Exception:
+            logger.exception("Error cargando configuraciones")
 
     def apply_settings_to_ui(self):
-        """Aplica las configuraciones cargadas a la interfaz"""
-        # Empresa
-        self.company_name.setText(self.current_settings.get('empresa_nombre', ''))
-        self.company_ruc.setText(self.current_settings.get('empresa_ruc', ''))
-        # ... aplicar más configuraciones
+        """Aplica las configuraciones cargadas a la interfaz.
+
+        Se llama dentro de _silent(), así que los setText no disparan
+        textChanged ni el guardado automático.
+        """
+        for clave, attr in self.FIELD_MAP.items():
+            getattr(self, attr).setText(self.db.get_config(clave, ''))
+
+    def apply_security_settings(self):
+        """Aplica las configuraciones de seguridad cargadas"""
+        self.session_timeout.setValue(int(self.db.get_config('session_timeout') or 30))
 
     def load_discounts_list(self):
         """Carga la lista de descuentos"""
+        self._run_db(
+            _fetch_discounts_first_page,
+            on_done=lambda result: self.discounts_model.set_first_page(*result),
+            on_failed=lambda error: logger.warning("Error cargando descuentos: %s", error)
+        )
+
+    def _set(self, clave, valor):
+        """Marca la clave para guardar solo si difiere del valor guardado"""
+        if self.db.get_config(clave) != valor:
+            self._settings_dirty[clave] = valor
+        else:
+            self._settings_dirty.pop(clave, None)
+
+    def _bind(self, signal, clave):
+        """Registra en _vals el último valor emitido por signal y programa el guardado"""
+        def on_change(value):
+            self._vals[clave] = str(value)
+            self._schedule_save()
+        signal.connect(on_change)
+
+    def _schedule_save(self):
+        """Reinicia el temporizador de guardado; varias ediciones seguidas se guardan una vez"""
+        self._save_timer.start()
+
+    def _autosave_settings(self):
         try:
-            discounts = self.db.fetch("SELECT id, nombre, tipo, porcentaje FROM Descuentos")
-            self.discounts_table.setRowCount(len(discounts))
-            
-            for row, discount in enumerate(discounts):
-                for col, value in enumerate(discount):
-                    item = QTableWidgetItem(str(value))
-                    self.discounts_table.setItem(row, col, item)
-                    
-        except Exception as e:
-            print(f"Error cargando descuentos: {e}")
+            self._persist_settings()
+        except Exception:
+            logger.exception("Error guardando configuraciones")
+
+    def _persist_settings(self):
+        """Escribe en la base de datos solo las claves que cambiaron"""
+        # Valores editados, ya leídos por las señales de cada control
+        for clave, valor in self._vals.items():
+            self._set(clave, valor)
+        self._vals.clear()
+        
+        if self._settings_dirty:
+            # Si set_configs falla, las claves siguen marcadas para el próximo intento
+            self.db.set_configs(list(self._settings_dirty.items()))
+            self._settings_dirty.clear()
+
+    def load_backup_list(self):
+        """Lista los backups del directorio con una sola pasada de os.scandir"""
+        try:
+            entries = []
+            with os.scandir(self.backup_dir) as it:
+                for entry in it:
+                    if entry.name.startswith("backup_") and entry.name.endswith((".db", ".db.gz")):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, entry.name, stat.st_size))
+            entries.sort(reverse=True)
+            self.backup_model.setStringList(
+                [f"{name}  ({size // 1024} KB)" for _, name, size in entries]
+            )
+        except OSError:
+            logger.exception("Error listando backups")
 
     def save_all_settings(self):
         """Guarda todas las configuraciones"""
         try:
-            # Recopilar configuraciones de todos los tabs
-            settings_to_save = {
-                'empresa_nombre': self.company_name.text(),
-                'empresa_ruc': self.company_ruc.text(),
-                # ... recopilar más configuraciones
-            }
-            
-            # Guardar en base de datos
-            for clave, valor in settings_to_save.items():
-                self.db.set_config(clave, valor)
+            self._save_timer.stop()
+            self._persist_settings()
             
             QMessageBox.information(self, "Configuración Guardada", 
                                   "Todas las configuraciones han sido guardadas correctamente.")
@@ -874,29 +1140,47 @@ class ConfigFrame(QWidget):
                 QMessageBox.warning(self, "Validación", "El nombre del descuento es obligatorio.")
                 return
             
+            pct = round(porcentaje, 2)
             if self.discount_id.text():  # Actualizar
-                query = "UPDATE Descuentos SET nombre=?, tipo=?, porcentaje=? WHERE id=?"
-                self.db.execute(query, (nombre, tipo, porcentaje/100, self.discount_id.text()))
+                discount_id = int(self.discount_id.text())
+                query = SQL_UPDATE_DISCOUNT
+                params = (nombre, tipo, porcentaje/100, discount_id)
+                apply = lambda _: self.discounts_model.update_row((discount_id, nombre, tipo, pct))
             else:  # Insertar
-                query = "INSERT INTO Descuentos (nombre, tipo, porcentaje) VALUES (?, ?, ?)"
-                self.db.execute(query, (nombre, tipo, porcentaje/100))
+                query = SQL_INSERT_DISCOUNT
+                params = (nombre, tipo, porcentaje/100)
+                apply = lambda new_id: self.discounts_model.insert_row((new_id, nombre, tipo, pct))
             
-            self.load_discounts_list()
-            self.reset_discount_form()
-            QMessageBox.information(self, "Éxito", "Descuento guardado correctamente.")
+            self.save_discount_btn.setEnabled(False)
+            self._run_db(
+                _execute, query, params,
+                on_done=lambda result: self._on_discount_written(
+                    apply, result, "Descuento guardado correctamente."),
+                on_failed=lambda error: self._on_discount_failed(f"Error guardando descuento: {error}")
+            )
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error guardando descuento: {e}")
 
+    def _on_discount_written(self, apply, result, message):
+        """Refleja la escritura en el modelo en sitio, sin volver a consultar la tabla"""
+        self.save_discount_btn.setEnabled(True)
+        apply(result)
+        self.reset_discount_form()
+        QMessageBox.information(self, "Éxito", message)
+
+    def _on_discount_failed(self, message):
+        self.save_discount_btn.setEnabled(True)
+        QMessageBox.critical(self, "Error", message)
+
     def delete_discount(self):
         """Elimina el descuento seleccionado"""
-        current_row = self.discounts_table.currentRow()
-        if current_row < 0:
+        current = self.discounts_table.currentIndex()
+        if not current.isValid():
             QMessageBox.warning(self, "Selección", "Seleccione un descuento para eliminar.")
             return
         
-        discount_id = self.discounts_table.item(current_row, 0).text()
-        discount_name = self.discounts_table.item(current_row, 1).text()
+        discount_id, discount_name = self.discounts_model.row_at(current.row())[:2]
         
         reply = QMessageBox.question(
             self, "Confirmar Eliminación",
@@ -905,13 +1189,14 @@ class ConfigFrame(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            try:
-                self.db.execute("DELETE FROM Descuentos WHERE id = ?", (discount_id,))
-                self.load_discounts_list()
-                self.reset_discount_form()
-                QMessageBox.information(self, "Éxito", "Descuento eliminado correctamente.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error eliminando descuento: {e}")
+            self.save_discount_btn.setEnabled(False)
+            self._run_db(
+                _execute, SQL_DELETE_DISCOUNT, (discount_id,),
+                on_done=lambda result: self._on_discount_written(
+                    lambda _: self.discounts_model.remove_row(discount_id), result,
+                    "Descuento eliminado correctamente."),
+                on_failed=lambda error: self._on_discount_failed(f"Error eliminando descuento: {error}")
+            )
 
     def reset_discount_form(self):
         """Limpia el formulario de descuentos"""
@@ -923,9 +1208,39 @@ class ConfigFrame(QWidget):
         self.discount_active.setChecked(True)
 
     def preview_receipt(self):
-        """Muestra vista previa del recibo"""
-        QMessageBox.information(self, "Vista Previa", 
-                              "Función de vista previa de recibo en desarrollo.")
+        """Muestra vista previa del recibo con datos de ejemplo"""
+        template = self.receipt_template.toPlainText()
+        if not template.strip():
+            QMessageBox.warning(self, "Validación", "La plantilla no puede estar vacía.")
+            return
+        
+        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        context = {
+            'empresa_nombre': self.db.get_config('empresa_nombre', ''),
+            'empresa_ruc': self.db.get_config('empresa_ruc', ''),
+            'empresa_direccion': self.db.get_config('empresa_direccion', ''),
+            'empresa_telefono': self.db.get_config('empresa_telefono', ''),
+            'numero_factura': 'A-000001',
+            'fecha': now,
+            'cliente': 'Cliente de Ejemplo',
+            'cliente_nombre': 'Cliente de Ejemplo',
+            'items': '<tr><td>Producto de ejemplo</td><td>2</td><td>10.00</td><td>20.00</td></tr>',
+            'subtotal': '20.00',
+            'iva': '3.00',
+            'total': '23.00',
+            'monto_pagado': '25.00',
+            'vuelto': '2.00',
+            'fecha_impresion': now,
+        }
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Vista Previa del Recibo")
+        dialog.resize(480, 640)
+        layout = QVBoxLayout(dialog)
+        preview = QTextBrowser()
+        preview.setHtml(render_compiled_template(self._compile_template(template), context))
+        layout.addWidget(preview)
+        dialog.exec()
 
     def save_receipt_template(self):
         """Guarda la plantilla de recibo"""
@@ -936,10 +1251,17 @@ class ConfigFrame(QWidget):
         
         try:
             self.db.set_config('recibo_template', template)
+            self._compile_template(template)
             QMessageBox.information(self, "Éxito", "Plantilla guardada correctamente.")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error guardando plantilla: {e}")
 
+    def _compile_template(self, template):
+        """Devuelve los segmentos de template, recompilando solo si cambió"""
+        if self._compiled_template[0] != template:
+            self._compiled_template = (template, compile_receipt_template(template))
+        return self._compiled_template[1]
+
     def restore_default_template(self):
         """Restaura la plantilla por defecto"""
         reply = QMessageBox.question(
@@ -958,79 +1280,58 @@ class ConfigFrame(QWidget):
 
     def get_default_receipt_template(self):
         """Retorna la plantilla de recibo por defecto"""
-        return """<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>Recibo {{numero_factura}}</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; }
-        .header { text-align: center; margin-bottom: 20px; }
-        .info { margin-bottom: 15px; }
-        .items { width: 100%; border-collapse: collapse; margin: 15px 0; }
-        .items th, .items td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-        .total { text-align: right; font-weight: bold; margin-top: 15px; }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h2>{{empresa_nombre}}</h2>
-        <p>RUC: {{empresa_ruc}}</p>
-        <p>{{empresa_direccion}}</p>
-    </div>
-    
-    <div class="info">
-        <p><strong>Factura:</strong> {{numero_factura}}</p>
-        <p><strong>Fecha:</strong> {{fecha}}</p>
-        <p><strong>Cliente:</strong> {{cliente_nombre}}</p>
-    </div>
-    
-    <table class="items">
-        <thead>
-            <tr>
-                <th>Producto</th>
-                <th>Cantidad</th>
-                <th>Precio</th>
-                <th>Total</th>
-            </tr>
-        </thead>
-        <tbody>
-            {{items}}
-        </tbody>
-    </table>
-    
-    <div class="total">
-        <p>Subtotal: ${{subtotal}}</p>
-        <p>IVA: ${{iva}}</p>
-        <p><strong>Total: ${{total}}</strong></p>
-    </div>
-</body>
-</html>"""
+        return _DEFAULT_RECEIPT_TEMPLATE
+
+    def _start_backup_job(self, src_path, dst_path, on_done):
+        """Lanza un BackupJob en el pool global y enlaza su progreso a la interfaz"""
+        job = BackupJob(src_path, dst_path)
+        job.signals.progress.connect(self.backup_progress.setValue)
+        job.signals.done.connect(on_done)
+        job.signals.failed.connect(self._on_backup_failed)
+        self._backup_job = job
+        self._set_backup_busy(True)
+        QThreadPool.globalInstance().start(job)
+
+    def _set_backup_busy(self, busy):
+        self.backup_progress.setValue(0)
+        self.backup_progress.setVisible(busy)
+        self.backup_now_btn.setEnabled(not busy)
+        self.restore_btn.setEnabled(not busy)
+
+    def _on_backup_failed(self, error):
+        self._set_backup_busy(False)
+        self._backup_job = None
+        QMessageBox.critical(self, "Error", f"Error en la operación de backup: {error}")
 
     def create_backup(self):
         """Crea un backup de la base de datos"""
         try:
             filename, _ = QFileDialog.getSaveFileName(
                 self, "Guardar Backup", 
-                f"backup_erp_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db",
-                "Database Files (*.db)"
+                os.path.join(self.backup_dir, f"backup_erp_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"),
+                "Database Files (*.db);;Compressed Database (*.db.gz)"
             )
             
             if filename:
-                # Copiar archivo de base de datos
-                shutil.copy2('erp_database.db', filename)
-                QMessageBox.information(self, "Backup Completado", 
-                                      f"Backup guardado en:\n{filename}")
+                # Copiar la base de datos activa fuera del hilo de la interfaz
+                self._start_backup_job(self.db.db_name, filename, self._on_backup_created)
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error creando backup: {e}")
 
+    def _on_backup_created(self, filename):
+        self._set_backup_busy(False)
+        self._backup_job = None
+        self.load_backup_list()
+        QMessageBox.information(self, "Backup Completado", 
+                              f"Backup guardado en:\n{filename}")
+
     def restore_backup(self):
         """Restaura un backup de la base de datos"""
         try:
             filename, _ = QFileDialog.getOpenFileName(
                 self, "Seleccionar Backup", 
-                "", "Database Files (*.db)"
+                "", "Database Files (*.db *.db.gz)"
             )
             
             if filename:
@@ -1042,20 +1343,32 @@ class ConfigFrame(QWidget):
                 )
                 
                 if reply == QMessageBox.Yes:
-                    # Crear backup de la base actual antes de restaurar
-                    backup_name = f"backup_pre_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-                    shutil.copy2('erp_database.db', backup_name)
-                    
-                    # Restaurar backup
-                    shutil.copy2(filename, 'erp_database.db')
-                    
-                    QMessageBox.information(self, "Restauración Completada", 
-                                          "Base de datos restaurada correctamente.\n\n"
-                                          f"Backup anterior guardado como: {backup_name}")
+                    # Crear backup de la base actual antes de restaurar;
+                    # la restauración se encadena al terminar
+                    backup_name = os.path.join(
+                        self.backup_dir,
+                        f"backup_pre_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
+                    )
+                    self._start_backup_job(
+                        self.db.db_name, backup_name,
+                        lambda _: self._start_backup_job(
+                            filename, self.db.db_name,
+                            lambda _: self._on_backup_restored(backup_name)
+                        )
+                    )
                     
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error restaurando backup: {e}")
 
+    def _on_backup_restored(self, backup_name):
+        self._set_backup_busy(False)
+        self._backup_job = None
+        self.load_all_settings(refresh=True)
+        self.load_backup_list()
+        QMessageBox.information(self, "Restauración Completada", 
+                              "Base de datos restaurada correctamente.\n\n"
+                              f"Backup anterior guardado como: {backup_name}")
+
 # Función para crear la tabla de configuración si no existe
 def create_config_table(db):
     """Crea la tabla de configuración si no existe"""
@@ -1066,7 +1379,7 @@ def create_config_table(db):
             descripcion TEXT,
             categoria TEXT,
             fecha_actualizacion DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
+        ) WITHOUT ROWID
     """)
     
     # Insertar configuraciones por defecto
@@ -1082,8 +1395,9 @@ def create_config_table(db):
         ('zona_horaria', 'America/Mexico_City', 'Zona horaria', 'regional'),
     ]
     
-    for clave, valor, descripcion, categoria in default_configs:
-        db.execute("""
+    # Una sola transacción para todas las filas por defecto
+    with db.transaction():
+        db.conn.executemany("""
             INSERT OR IGNORE INTO Configuracion (clave, valor, descripcion, categoria)
             VALUES (?, ?, ?, ?)
-        """, (clave, valor, descripcion, categoria))
\ No newline at end of file
+        """, default_configs)
\ No newline at end of file
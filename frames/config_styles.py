@@ -0,0 +1,229 @@
+"""
+frames/config_styles.py
+Hojas de estilo (QSS) del módulo de Configuración - Windows 11 Style
+Constantes construidas una sola vez al importar el módulo.
+"""
+
+GROUP_QSS = """
+    QGroupBox#erpGroup {
+        font-weight: bold;
+        font-size: 14px;
+        color: #1E293B;
+        border: 1px solid #E2E8F0;
+        border-radius: 8px;
+        margin-top: 10px;
+        padding-top: 10px;
+    }
+    QGroupBox#erpGroup::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px 0 5px;
+    }
+"""
+
+PRIMARY_BTN_QSS = """
+    QPushButton#erpPrimaryBtn {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #3B82F6, stop:1 #60A5FA);
+        border: none;
+        border-radius: 8px;
+        color: white;
+        font-weight: 600;
+        padding: 10px 20px;
+    }
+    QPushButton#erpPrimaryBtn:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #2563EB, stop:1 #3B82F6);
+    }
+"""
+
+SECONDARY_BTN_QSS = """
+    QPushButton#erpSecondaryBtn {
+        background: transparent;
+        border: 1.5px solid #E2E8F0;
+        border-radius: 8px;
+        color: #475569;
+        font-weight: 500;
+        padding: 10px 20px;
+    }
+    QPushButton#erpSecondaryBtn:hover {
+        background: #F1F5F9;
+        border-color: #CBD5E1;
+    }
+"""
+
+DANGER_BTN_QSS = """
+    QPushButton#erpDangerBtn {
+        background: transparent;
+        border: 1.5px solid #FECACA;
+        border-radius: 8px;
+        color: #DC2626;
+        font-weight: 500;
+        padding: 10px 20px;
+    }
+    QPushButton#erpDangerBtn:hover {
+        background: #FEF2F2;
+        border-color: #FCA5A5;
+    }
+"""
+
+SUCCESS_BTN_QSS = """
+    QPushButton#erpSuccessBtn {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #10B981, stop:1 #34D399);
+        border: none;
+        border-radius: 8px;
+        color: white;
+        font-weight: 600;
+        padding: 10px 20px;
+    }
+    QPushButton#erpSuccessBtn:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #059669, stop:1 #10B981);
+    }
+"""
+
+TEXTEDIT_QSS = """
+    QTextEdit#erpTextEdit {
+        background: white;
+        border: 1.5px solid #E2E8F0;
+        border-radius: 8px;
+        padding: 8px 12px;
+        font-family: 'Segoe UI';
+        font-size: 13px;
+        color: #1E293B;
+    }
+    QTextEdit#erpTextEdit:focus {
+        border-color: #3B82F6;
+        background: #F8FAFF;
+    }
+"""
+
+TEMPLATE_EDITOR_QSS = """
+    QTextEdit#erpTemplateEditor {
+        background: white;
+        border: 1.5px solid #E2E8F0;
+        border-radius: 8px;
+        padding: 12px;
+        font-family: 'Courier New';
+        font-size: 12px;
+    }
+    QTextEdit#erpTemplateEditor:focus {
+        border-color: #3B82F6;
+    }
+"""
+
+COMBO_QSS = """
+    QComboBox#erpCombo {
+        background: white;
+        border: 1.5px solid #E2E8F0;
+        border-radius: 8px;
+        padding: 8px 12px;
+        font-family: 'Segoe UI';
+        font-size: 13px;
+        color: #1E293B;
+        min-height: 38px;
+    }
+    QComboBox#erpCombo:focus {
+        border-color: #3B82F6;
+    }
+"""
+
+SPINBOX_QSS = """
+    QSpinBox#erpSpin, QDoubleSpinBox#erpSpin {
+        background: white;
+        border: 1.5px solid #E2E8F0;
+        border-radius: 8px;
+        padding: 8px 12px;
+        font-family: 'Segoe UI';
+        font-size: 13px;
+        color: #1E293B;
+        min-height: 38px;
+    }
+    QSpinBox#erpSpin:focus, QDoubleSpinBox#erpSpin:focus {
+        border-color: #3B82F6;
+    }
+"""
+
+TABLE_QSS = """
+    QTableView#erpTable {
+        background: white;
+        border: 1px solid #E2E8F0;
+        border-radius: 8px;
+        gridline-color: #F1F5F9;
+    }
+    QTableView#erpTable::item {
+        padding: 8px;
+        border-bottom: 1px solid #F1F5F9;
+    }
+    QTableView#erpTable QHeaderView::section {
+        background: #F8FAFC;
+        padding: 12px 8px;
+        border: none;
+        border-bottom: 2px solid #E2E8F0;
+    }
+"""
+
+TABS_QSS = """
+    QTabWidget#erpTabs::pane {
+        border: 1px solid #E2E8F0;
+        border-radius: 8px;
+        background: white;
+    }
+    QTabWidget#erpTabs > QTabBar::tab {
+        background: #F8FAFC;
+        border: 1px solid #E2E8F0;
+        padding: 12px 20px;
+        margin-right: 2px;
+        border-top-left-radius: 6px;
+        border-top-right-radius: 6px;
+        font-weight: 500;
+    }
+    QTabWidget#erpTabs > QTabBar::tab:selected {
+        background: white;
+        border-bottom: none;
+    }
+    QTabWidget#erpTabs > QTabBar::tab:hover {
+        background: #F1F5F9;
+    }
+"""
+
+BACKUP_LIST_QSS = """
+    QListView#erpBackupList {
+        background: white;
+        border: 1px solid #E2E8F0;
+        border-radius: 6px;
+    }
+"""
+
+# Los QLineEdit#erpInput siguen bajo QStyleSheetStyle (hay hojas en la
+# aplicación y en ConfigFrame), pero su panel lo pinta ERPStyle
+# (frames/erp_style.py). Para eso ninguna regla puede darles fondo: la de
+# APP_QSS "QFrame#erpContent * { background: transparent; }" haría que
+# QStyleSheetStyle pintara el fondo él mismo y no pidiera PE_PanelLineEdit
+# al estilo base. background: none anula esa regla. Fuente, color de texto
+# y márgenes los pone ERPStyle.setup_input.
+INPUT_QSS = """
+    QLineEdit#erpInput {
+        background: none;
+    }
+"""
+
+# Hoja de estilo aplicada una sola vez sobre ConfigFrame: cada control
+# la recibe por su objectName (erpCombo, erpPrimaryBtn, ...) sin
+# setStyleSheet propio.
+GLOBAL_QSS = "".join((
+    GROUP_QSS,
+    INPUT_QSS,
+    PRIMARY_BTN_QSS,
+    SECONDARY_BTN_QSS,
+    DANGER_BTN_QSS,
+    SUCCESS_BTN_QSS,
+    TEXTEDIT_QSS,
+    TEMPLATE_EDITOR_QSS,
+    COMBO_QSS,
+    SPINBOX_QSS,
+    TABLE_QSS,
+    TABS_QSS,
+    BACKUP_LIST_QSS,
+))
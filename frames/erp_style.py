@@ -0,0 +1,66 @@
+"""
+frames/erp_style.py
+Estilo de aplicación ERP (QProxyStyle) - Windows 11 Style
+Pinta directamente los controles de diseño fijo en lugar de describirlos
+con reglas QSS. Las hojas de estilo siguen activas sobre esos controles:
+no deben darles fondo ni borde, o QStyleSheetStyle los pinta él mismo y
+no llega a llamar a este estilo (ver INPUT_QSS en frames/config_styles.py).
+"""
+
+from PySide6.QtWidgets import QProxyStyle, QStyle, QLineEdit
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QColor, QFont, QPainter, QPalette, QPen
+
+
+class ERPStyle(QProxyStyle):
+    """Estilo base de la aplicación con campos de texto redondeados"""
+
+    INPUT_OBJECT_NAME = "erpInput"
+    INPUT_RADIUS = 8.0
+    INPUT_BORDER_WIDTH = 1.5
+
+    BORDER_COLOR = QColor("#E2E8F0")
+    FOCUS_COLOR = QColor("#3B82F6")
+    BACKGROUND = QColor("#FFFFFF")
+    FOCUS_BACKGROUND = QColor("#F8FAFF")
+    INPUT_TEXT_COLOR = QColor("#1E293B")
+    # Equivale al antiguo padding: 8px 12px; Fusion ya deja 3px entre el
+    # borde y el texto (marco de 2px más el margen interno de QLineEdit)
+    INPUT_TEXT_MARGINS = (9, 5, 9, 5)
+
+    # Fuente compartida por todos los campos; se crea con la primera
+    _input_font = None
+
+    @classmethod
+    def setup_input(cls, line_edit):
+        """Marca un QLineEdit como erpInput y le da fuente, color de texto y márgenes"""
+        if cls._input_font is None:
+            cls._input_font = QFont("Segoe UI")
+            cls._input_font.setPixelSize(13)
+        line_edit.setObjectName(cls.INPUT_OBJECT_NAME)
+        line_edit.setFont(cls._input_font)
+        palette = line_edit.palette()
+        palette.setColor(QPalette.Text, cls.INPUT_TEXT_COLOR)
+        line_edit.setPalette(palette)
+        line_edit.setTextMargins(*cls.INPUT_TEXT_MARGINS)
+
+    def drawPrimitive(self, element, option, painter, widget=None):
+        if (element == QStyle.PE_PanelLineEdit
+                and isinstance(widget, QLineEdit)
+                and widget.objectName() == self.INPUT_OBJECT_NAME):
+            self._draw_input_panel(option, painter)
+            return
+        super().drawPrimitive(element, option, painter, widget)
+
+    def _draw_input_panel(self, option, painter):
+        has_focus = bool(option.state & QStyle.State_HasFocus)
+        half = self.INPUT_BORDER_WIDTH / 2
+        rect = QRectF(option.rect).adjusted(half, half, -half, -half)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(self.FOCUS_COLOR if has_focus else self.BORDER_COLOR,
+                            self.INPUT_BORDER_WIDTH))
+        painter.setBrush(self.FOCUS_BACKGROUND if has_focus else self.BACKGROUND)
+        painter.drawRoundedRect(rect, self.INPUT_RADIUS, self.INPUT_RADIUS)
+        painter.restore()
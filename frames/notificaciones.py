@@ -19,9 +19,10 @@ from PySide6.QtCore import Qt, QTimer, QPoint, QPropertyAnimation, QEasingCurve,
 from PySide6.QtGui import QFont, QColor, QPalette, QLinearGradient, QPainter, QIcon
 from datetime import datetime, timedelta
 import typing
-import json
 import os
 
+from frames._json import dumps, loads
+
 class AnimatedButton(QPushButton):
     """Botón con animaciones suaves al estilo Windows 11"""
     
@@ -79,7 +80,7 @@ class NotificationManager(QObject):
             config_path = "notification_config.json"
             if os.path.exists(config_path):
                 with open(config_path, 'r', encoding='utf-8') as f:
-                    saved_config = json.load(f)
+                    saved_config = loads(f.read())
                     self.config.update(saved_config)
         except Exception:
             pass
@@ -89,7 +90,7 @@ class NotificationManager(QObject):
         try:
             config_path = "notification_config.json"
             with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, ensure_ascii=False, indent=2)
+                f.write(dumps(self.config, indent=True))
             self.config_changed.emit()
         except Exception:
             pass
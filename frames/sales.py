@@ -9,6 +9,21 @@ from datetime import datetime
 import random
 import os
 
+# Carritos con al menos estas líneas calculan los descuentos con el kernel
+# de numpy/numba; los normales usan Python puro y no importan numpy
+KERNEL_MIN_LINES = 500
+
+
+def _kernel_discounts(line_totals, pcts):
+    """Monto de descuento por línea con frames._discount_kernel (carga diferida)."""
+    import numpy as np
+    from frames._discount_kernel import apply_discounts
+
+    totals = np.array(line_totals, dtype=np.float64)
+    return apply_discounts(
+        totals, np.array(pcts, dtype=np.float64), np.zeros_like(totals)
+    ).tolist()
+
 
 class SalesFrame(ttk.Frame):
     """Frame de ventas POS."""
@@ -449,13 +464,21 @@ class SalesFrame(ttk.Frame):
         total_descuentos = 0.0
         productos_con_descuento = 0
 
-        for prod_id, data in self.cart.items():
+        items = list(self.cart.items())
+        line_totals = [data["precio_unitario"] * data["cantidad"] for _, data in items]
+        pcts = [data["descuento_porcentaje"] for _, data in items]
+        if len(items) >= KERNEL_MIN_LINES:
+            desc_montos = _kernel_discounts(line_totals, pcts)
+        else:
+            desc_montos = [line_total * pct for line_total, pct in zip(line_totals, pcts)]
+
+        for (prod_id, data), line_total, desc_monto in zip(items, line_totals, desc_montos):
             cant = data["cantidad"]
             precio = data["precio_unitario"]
             desc_pct = data["descuento_porcentaje"]
 
-            desc_monto = (precio * cant) * desc_pct
-            subtotal = (precio * cant) - desc_monto
+            desc_monto = float(desc_monto)
+            subtotal = float(line_total) - desc_monto
             total += subtotal
             total_descuentos += desc_monto
 
@@ -1676,7 +1699,11 @@ class SalesFrame(ttk.Frame):
         )
 
         if folder:
-            self.db.set_config("recibo_save_path", folder)
+            try:
+                self.db.set_config("recibo_save_path", folder)
+            except Exception as e:
+                messagebox.showerror("Error", f"No se pudo guardar la carpeta: {e}")
+                return
             self.path_label.config(text=folder)
             messagebox.showinfo(
                 "Carpeta Configurada", f"Los recibos se guardarán en:\n{folder}"
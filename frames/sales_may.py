@@ -1520,7 +1520,11 @@ Presione "PROCESAR VENTA" para finalizar.
         if not save_path or not os.path.isdir(save_path):
             save_path = os.path.join(os.path.expanduser("~"), "Documentos_Ventas")
             os.makedirs(save_path, exist_ok=True)
-            self.db.set_config("recibo_save_path", save_path)
+            # Recordar la carpeta es opcional: el documento se guarda igual
+            try:
+                self.db.set_config("recibo_save_path", save_path)
+            except Exception as e:
+                print(f"Error guardando carpeta de documentos: {e}")
         
         file_path = os.path.join(save_path, filename)
         
@@ -1,16 +1,60 @@
 # main.py  — Estilo Windows 11 Profesional
 import sys
+import inspect
+import logging
+from functools import lru_cache, partial
+from types import MappingProxyType
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QFrame, QStackedWidget, QDialog, QLineEdit,
-    QFormLayout, QMessageBox
+    QGridLayout, QMessageBox, QButtonGroup
+)
+from PySide6.QtCore import Qt, QTimer, QEvent, QSize
+from PySide6.QtGui import (
+    QFont, QPalette, QColor, QLinearGradient, QPainter, QPixmap, QPixmapCache, QIcon
 )
-from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer, Property
-from PySide6.QtGui import QFont, QPalette, QColor, QLinearGradient, QPainter
 
 from database import DBManager
-from file_manager import FileManager
 from frames.notificaciones import NotificationManager
+from frames.erp_style import ERPStyle
+from app_styles import APP_QSS
+
+@lru_cache(maxsize=None)
+def _font(size, weight=QFont.Normal, family="Segoe UI"):
+    """QFont compartida por tamaño y peso; se crea en el primer uso porque
+    QFont requiere una QApplication existente."""
+    return QFont(family, size, weight)
+
+def _emoji_pixmap(ch, pt):
+    """Emoji rasterizado una sola vez en un QPixmap cuadrado y guardado en QPixmapCache"""
+    key = f"emoji:{ch}:{pt}"
+    pm = QPixmap()
+    if QPixmapCache.find(key, pm):
+        return pm
+    pm = QPixmap(pt * 2, pt * 2)
+    pm.fill(Qt.transparent)
+    painter = QPainter(pm)
+    painter.setFont(_font(pt, family="Segoe UI Emoji"))
+    painter.drawText(pm.rect(), Qt.AlignCenter, ch)
+    painter.end()
+    QPixmapCache.insert(key, pm)
+    return pm
+
+# Paleta de la aplicación: (rol, RGB)
+_PALETTE_COLORS = (
+    (QPalette.Window, (248, 250, 252)),
+    (QPalette.WindowText, (30, 41, 59)),
+    (QPalette.Base, (255, 255, 255)),
+    (QPalette.AlternateBase, (248, 250, 252)),
+    (QPalette.ToolTipBase, (255, 255, 255)),
+    (QPalette.ToolTipText, (30, 41, 59)),
+    (QPalette.Text, (30, 41, 59)),
+    (QPalette.Button, (248, 250, 252)),
+    (QPalette.ButtonText, (30, 41, 59)),
+    (QPalette.BrightText, (255, 255, 255)),
+    (QPalette.Highlight, (59, 130, 246)),
+    (QPalette.HighlightedText, (255, 255, 255)),
+)
 
 # Intento seguro de importar frames (si faltan, usamos placeholder)
 def safe_import_frame(module_path: str, class_name: str):
@@ -21,50 +65,48 @@ def safe_import_frame(module_path: str, class_name: str):
         print(f"[WARN] No se pudo importar {module_path}.{class_name}: {e}")
         return None
 
-DashboardFrameCls = safe_import_frame("frames.dashboard", "DashboardFrame")
-ProductFrameCls = safe_import_frame("frames.product", "ProductFrame")
-SupplierFrameCls = safe_import_frame("frames.suppliers", "SupplierFrame")
-ConfigFrameCls = safe_import_frame("frames.config", "ConfigFrame")
-SalesFrameCls = safe_import_frame("frames.sales", "SalesFrame")
-ClientsFrameCls = safe_import_frame("frames.clients", "ClientsFrame")
+# Pestaña -> (módulo, clase) de su frame; nada se importa al cargar main
+_LAZY_FRAMES = {
+    "Dashboard": ("frames.dashboard", "DashboardFrame"),
+    "Productos": ("frames.product", "ProductFrame"),
+    "Proveedores": ("frames.suppliers", "SupplierFrame"),
+    "Configuración": ("frames.config", "ConfigFrame"),
+    "Clientes": ("frames.clients", "ClientsFrame"),
+    "Ventas (POS)": ("frames.sales", "SalesFrame"),
+}
+
+def __getattr__(name):
+    """PEP 562: importa el frame de una pestaña en el primer acceso y lo
+    deja como atributo del módulo (None si no se pudo importar)."""
+    if name not in _LAZY_FRAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    cls = safe_import_frame(*_LAZY_FRAMES[name])
+    setattr(sys.modules[__name__], name, cls)
+    return cls
+
+def frame_class(name):
+    """Clase del frame de la pestaña name, importada bajo demanda"""
+    return getattr(sys.modules[__name__], name)
+
+@lru_cache(maxsize=None)
+def _frame_arity(cls):
+    """Argumentos posicionales (1 o 2) que espera el constructor de cls"""
+    try:
+        params = inspect.signature(cls).parameters.values()
+    except (TypeError, ValueError):
+        return 1
+    posicionales = sum(
+        p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in params
+    )
+    return 2 if posicionales >= 2 else 1
 
 
 class AnimatedButton(QPushButton):
-    """Botón con animaciones suaves al estilo Windows 11"""
+    """Botón con cursor de mano; el hover lo pinta la hoja de estilo (:hover)"""
     
     def __init__(self, text, parent=None):
         super().__init__(text, parent)
-        self._animation_progress = 0
         self.setCursor(Qt.PointingHandCursor)
-        
-        self.animation = QPropertyAnimation(self, b"animation_progress")
-        self.animation.setDuration(200)
-        self.animation.setEasingCurve(QEasingCurve.OutCubic)
-        
-    def get_animation_progress(self):
-        return self._animation_progress
-        
-    def set_animation_progress(self, value):
-        self._animation_progress = value
-        self.update()
-        
-    animation_progress = Property(float, get_animation_progress, set_animation_progress)
-    
-    def enterEvent(self, event):
-        self.animation.setDirection(QPropertyAnimation.Forward)
-        if self.animation.state() != QPropertyAnimation.Running:
-            self.animation.setStartValue(self._animation_progress)
-            self.animation.setEndValue(1.0)
-            self.animation.start()
-        super().enterEvent(event)
-        
-    def leaveEvent(self, event):
-        self.animation.setDirection(QPropertyAnimation.Backward)
-        if self.animation.state() != QPropertyAnimation.Running:
-            self.animation.setStartValue(self._animation_progress)
-            self.animation.setEndValue(0.0)
-            self.animation.start()
-        super().leaveEvent(event)
 
 
 class ModernLoginDialog(QDialog):
@@ -80,115 +122,59 @@ class ModernLoginDialog(QDialog):
         
         # Widget principal con sombra
         main_widget = QWidget()
-        main_widget.setStyleSheet("""
-            QWidget {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 #FFFFFF, stop:1 #F8FAFC);
-                border-radius: 12px;
-                border: 1px solid #E2E8F0;
-            }
-        """)
-        
-        layout = QVBoxLayout(main_widget)
+        main_widget.setObjectName("erpLoginCard")
+        
+        # Una sola rejilla: título (filas 0-1), separación (2), campos (3-4), botones (5)
+        layout = QGridLayout(main_widget)
         layout.setContentsMargins(32, 32, 32, 32)
-        layout.setSpacing(20)
+        layout.setHorizontalSpacing(12)
+        layout.setVerticalSpacing(12)
         
         # Header con logo
-        header_layout = QVBoxLayout()
-        header_layout.setAlignment(Qt.AlignCenter)
-        
         title = QLabel("Bienvenido")
-        title.setFont(QFont("Segoe UI", 18, QFont.Bold))
+        title.setFont(_font(18, QFont.Bold))
         title.setStyleSheet("color: #1E293B; margin-bottom: 4px;")
         
         subtitle = QLabel("Sistema ERP Empresarial")
-        subtitle.setFont(QFont("Segoe UI", 10))
+        subtitle.setFont(_font(10))
         subtitle.setStyleSheet("color: #64748B;")
         
-        header_layout.addWidget(title)
-        header_layout.addWidget(subtitle)
-        layout.addLayout(header_layout)
-        layout.addSpacing(10)
+        layout.addWidget(title, 0, 0, 1, 2, Qt.AlignCenter)
+        layout.addWidget(subtitle, 1, 0, 1, 2, Qt.AlignCenter)
+        layout.setRowMinimumHeight(2, 10)
         
         # Formulario
-        form_layout = QFormLayout()
-        form_layout.setVerticalSpacing(12)
-        form_layout.setLabelAlignment(Qt.AlignRight)
-        
         self.username = QLineEdit()
         self.username.setText("admin")
         self.username.setPlaceholderText("Ingrese su usuario")
         self.username.setMinimumHeight(38)
-        self.username.setStyleSheet("""
-            QLineEdit {
-                background: #FFFFFF;
-                border: 1.5px solid #E2E8F0;
-                border-radius: 8px;
-                padding: 8px 12px;
-                font-size: 14px;
-                color: #1E293B;
-            }
-            QLineEdit:focus {
-                border-color: #3B82F6;
-                background: #F8FAFF;
-            }
-        """)
+        self.username.setObjectName("erpLoginField")
         
         self.password = QLineEdit()
         self.password.setEchoMode(QLineEdit.Password)
         self.password.setText("1234")
         self.password.setPlaceholderText("Ingrese su contraseña")
         self.password.setMinimumHeight(38)
-        self.password.setStyleSheet(self.username.styleSheet())
+        self.password.setObjectName("erpLoginField")
         
-        form_layout.addRow("Usuario:", self.username)
-        form_layout.addRow("Contraseña:", self.password)
-        layout.addLayout(form_layout)
+        layout.addWidget(QLabel("Usuario:"), 3, 0, Qt.AlignRight | Qt.AlignVCenter)
+        layout.addWidget(self.username, 3, 1)
+        layout.addWidget(QLabel("Contraseña:"), 4, 0, Qt.AlignRight | Qt.AlignVCenter)
+        layout.addWidget(self.password, 4, 1)
         
         # Botones
-        btn_layout = QHBoxLayout()
-        btn_layout.setSpacing(12)
-        
         btn_cancel = AnimatedButton("Cancelar")
         btn_cancel.setMinimumHeight(38)
-        btn_cancel.setStyleSheet("""
-            AnimatedButton {
-                background: transparent;
-                border: 1.5px solid #E2E8F0;
-                border-radius: 8px;
-                color: #64748B;
-                font-weight: 600;
-                font-size: 14px;
-            }
-            AnimatedButton:hover {
-                background: #F1F5F9;
-                border-color: #CBD5E1;
-            }
-        """)
+        btn_cancel.setObjectName("erpLoginCancelBtn")
         btn_cancel.clicked.connect(self.reject)
         
         btn_login = AnimatedButton("Acceder al Sistema")
         btn_login.setMinimumHeight(38)
-        btn_login.setStyleSheet("""
-            AnimatedButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #2563EB, stop:1 #3B82F6);
-                border: none;
-                border-radius: 8px;
-                color: white;
-                font-weight: 600;
-                font-size: 14px;
-            }
-            AnimatedButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #1D4ED8, stop:1 #2563EB);
-            }
-        """)
+        btn_login.setObjectName("erpLoginBtn")
         btn_login.clicked.connect(self.attempt_login)
         
-        btn_layout.addWidget(btn_cancel)
-        btn_layout.addWidget(btn_login)
-        layout.addLayout(btn_layout)
+        layout.addWidget(btn_cancel, 5, 0)
+        layout.addWidget(btn_login, 5, 1)
         
         # Layout principal del dialog
         main_dialog_layout = QVBoxLayout(self)
@@ -208,17 +194,14 @@ class ModernLoginDialog(QDialog):
             return
             
         try:
-            row = self.db.fetch(
-                "SELECT id, nombre, rol FROM Usuarios WHERE usuario = ? AND contrasena = ?",
-                (user, pwd)
-            )
+            row = self.db.autenticar_usuario(user, pwd)
         except Exception as e:
             QMessageBox.critical(self, "Error de Base de Datos", 
                                f"Error al conectar con la base de datos:\n{str(e)}")
             return
 
         if row:
-            self.accepted_user = row[0]
+            self.accepted_user = row
             self.accept()
         else:
             QMessageBox.warning(self, "Acceso denegado", 
@@ -232,8 +215,8 @@ class PlaceholderFrame(QWidget):
         layout.setAlignment(Qt.AlignCenter)
         
         # Icono placeholder
-        icon_label = QLabel("📊")
-        icon_label.setFont(QFont("Segoe UI", 48))
+        icon_label = QLabel()
+        icon_label.setPixmap(_emoji_pixmap("📊", 48))
         icon_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(icon_label)
         
@@ -250,16 +233,21 @@ class PlaceholderFrame(QWidget):
 
 
 class ModernSidebar(QFrame):
+    # (icono, texto, pestaña) del menú de navegación
+    MENU_ITEMS = (
+        ("🏠", "Dashboard", "Dashboard"),
+        ("💰", "Ventas (POS)", "Ventas (POS)"),
+        ("👥", "Clientes", "Clientes"),
+        ("📦", "Productos", "Productos"),
+        ("🏢", "Proveedores", "Proveedores"),
+        ("⚙️", "Configuración", "Configuración"),
+        ("🔔", "Notificaciones", "Notificaciones"),
+    )
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFixedWidth(280)
-        self.setStyleSheet("""
-            ModernSidebar {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #F8FAFC, stop:1 #FFFFFF);
-                border-right: 1px solid #E2E8F0;
-            }
-        """)
+        self.setObjectName("erpSidebar")
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(16, 20, 16, 20)
@@ -270,11 +258,11 @@ class ModernSidebar(QFrame):
         brand_layout.setSpacing(4)
         
         brand_title = QLabel("Sistema ERP")
-        brand_title.setFont(QFont("Segoe UI", 16, QFont.Bold))
+        brand_title.setFont(_font(16, QFont.Bold))
         brand_title.setStyleSheet("color: #1E293B;")
         
         brand_subtitle = QLabel("Empresa XYZ")
-        brand_subtitle.setFont(QFont("Segoe UI", 10))
+        brand_subtitle.setFont(_font(10))
         brand_subtitle.setStyleSheet("color: #64748B;")
         
         brand_layout.addWidget(brand_title)
@@ -284,59 +272,26 @@ class ModernSidebar(QFrame):
         
         # Navigation menu
         self.btns = {}
-        menu_items = [
-            ("🏠", "Dashboard", "Dashboard"),
-            ("💰", "Ventas (POS)", "Ventas (POS)"),
-            ("👥", "Clientes", "Clientes"),
-            ("📦", "Productos", "Productos"),
-            ("🏢", "Proveedores", "Proveedores"),
-            ("⚙️", "Configuración", "Configuración"),
-            ("🔔", "Notificaciones", "Notificaciones")
-        ]
-        
-        for icon, text, name in menu_items:
-            btn = AnimatedButton(f"   {icon}  {text}")
+        # Grupo exclusivo: marcar un botón desmarca el anterior en Qt
+        self.button_group = QButtonGroup(self)
+        self.button_group.setExclusive(True)
+        for idx, (icon, text, name) in enumerate(self.MENU_ITEMS):
+            btn = AnimatedButton(f"  {text}")
+            btn.setIcon(QIcon(_emoji_pixmap(icon, 10)))
+            btn.setIconSize(QSize(20, 20))
             btn.setCheckable(True)
             btn.setMinimumHeight(42)
-            btn.setStyleSheet("""
-                AnimatedButton {
-                    background: transparent;
-                    border: none;
-                    text-align: left;
-                    padding: 10px 16px;
-                    font-family: 'Segoe UI';
-                    font-size: 14px;
-                    color: #475569;
-                    border-radius: 8px;
-                    margin: 2px 0;
-                }
-                AnimatedButton:hover {
-                    background: #F1F5F9;
-                    color: #1E293B;
-                }
-                AnimatedButton:checked {
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                        stop:0 #3B82F6, stop:1 #60A5FA);
-                    color: white;
-                    font-weight: 600;
-                }
-            """)
-            btn.clicked.connect(lambda checked, n=name: parent.show_frame(n))
+            btn.setObjectName("erpSidebarNavBtn")
+            btn.clicked.connect(partial(parent.show_frame, name))
             layout.addWidget(btn)
+            self.button_group.addButton(btn, idx)
             self.btns[name] = btn
         
         layout.addStretch()
         
         # User info section
         user_section = QFrame()
-        user_section.setStyleSheet("""
-            QFrame {
-                background: #F8FAFC;
-                border-radius: 8px;
-                border: 1px solid #E2E8F0;
-                padding: 12px;
-            }
-        """)
+        user_section.setObjectName("erpUserCard")
         
         user_layout = QVBoxLayout(user_section)
         
@@ -348,19 +303,7 @@ class ModernSidebar(QFrame):
         
         logout_btn = AnimatedButton("🚪  Cerrar sesión")
         logout_btn.setMinimumHeight(36)
-        logout_btn.setStyleSheet("""
-            AnimatedButton {
-                background: transparent;
-                border: 1px solid #FECACA;
-                border-radius: 6px;
-                color: #DC2626;
-                font-size: 12px;
-                font-weight: 500;
-            }
-            AnimatedButton:hover {
-                background: #FEF2F2;
-            }
-        """)
+        logout_btn.setObjectName("erpLogoutBtn")
         logout_btn.clicked.connect(parent.logout)
         
         user_layout.addWidget(self.lbl_user)
@@ -372,29 +315,41 @@ class ModernSidebar(QFrame):
 
 
 class ERPMainWindow(QMainWindow):
+    # Título del header por pestaña
+    FRAME_TITLES = MappingProxyType({
+        "Dashboard": "Panel Principal",
+        "Ventas (POS)": "Sistema de Ventas POS",
+        "Clientes": "Gestión de Clientes",
+        "Productos": "Inventario de Productos",
+        "Proveedores": "Gestión de Proveedores",
+        "Configuración": "Configuración del Sistema",
+        "Notificaciones": "Centro de Notificaciones"
+    })
+    # Orden en que se precargan los módulos de frames tras el login
+    _prewarm_order = ("Ventas (POS)", "Clientes", "Productos", "Proveedores", "Configuración")
+    # El login se abre en el primer Show de la ventana (ver event); atributo
+    # de clase porque event() ya recibe eventos durante __init__
+    _login_shown = False
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Sistema ERP Empresarial - Windows 11 Style")
         self.resize(1600, 1000)
         self.setMinimumSize(1200, 800)
 
-        # DB y filemanager
+        # DB; el FileManager (Tkinter) se crea en su primer uso
         self.db = DBManager()
-        self.file_manager = FileManager(self.db)
+        self._file_manager = None
 
-        # Notification manager (PySide6)
+        # Notification manager (PySide6); el chequeo de stock arranca tras el login
         self.notification_manager = NotificationManager(self, self.db)
-        try:
-            self.notification_manager.stock_check_timer.start()
-        except Exception:
-            pass
 
         # datos de usuario
         self.current_user = None
 
         # Estructura main con estilo moderno
         central_widget = QWidget()
-        central_widget.setStyleSheet("background: #F8FAFC;")
+        central_widget.setObjectName("erpCentral")
         self.setCentralWidget(central_widget)
         
         main_layout = QHBoxLayout(central_widget)
@@ -407,7 +362,6 @@ class ERPMainWindow(QMainWindow):
 
         # Área principal con header y contenido
         main_area = QWidget()
-        main_area.setStyleSheet("background: #F8FAFC;")
         main_area_layout = QVBoxLayout(main_area)
         main_area_layout.setContentsMargins(0, 0, 0, 0)
         main_area_layout.setSpacing(0)
@@ -415,19 +369,13 @@ class ERPMainWindow(QMainWindow):
         # Header moderno
         header = QFrame()
         header.setFixedHeight(60)
-        header.setStyleSheet("""
-            QFrame {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #FFFFFF, stop:1 #F8FAFC);
-                border-bottom: 1px solid #E2E8F0;
-            }
-        """)
+        header.setObjectName("erpHeader")
         
         header_layout = QHBoxLayout(header)
         header_layout.setContentsMargins(24, 0, 24, 0)
         
         self.header_title = QLabel("Dashboard")
-        self.header_title.setFont(QFont("Segoe UI", 16, QFont.Bold))
+        self.header_title.setFont(_font(16, QFont.Bold))
         self.header_title.setStyleSheet("color: #1E293B;")
         
         header_layout.addWidget(self.header_title)
@@ -439,39 +387,17 @@ class ERPMainWindow(QMainWindow):
         
         btn_minimize = AnimatedButton("−")
         btn_minimize.setFixedSize(28, 28)
-        btn_minimize.setStyleSheet("""
-            AnimatedButton {
-                background: transparent;
-                border: 1px solid #E2E8F0;
-                border-radius: 6px;
-                color: #64748B;
-                font-weight: bold;
-            }
-            AnimatedButton:hover {
-                background: #F1F5F9;
-            }
-        """)
+        btn_minimize.setObjectName("erpWinCtrlBtn")
         btn_minimize.clicked.connect(self.showMinimized)
         
         btn_maximize = AnimatedButton("□")
         btn_maximize.setFixedSize(28, 28)
-        btn_maximize.setStyleSheet(btn_minimize.styleSheet())
+        btn_maximize.setObjectName("erpWinCtrlBtn")
         btn_maximize.clicked.connect(self.toggle_maximize)
         
         btn_close = AnimatedButton("×")
         btn_close.setFixedSize(28, 28)
-        btn_close.setStyleSheet("""
-            AnimatedButton {
-                background: transparent;
-                border: 1px solid #FECACA;
-                border-radius: 6px;
-                color: #DC2626;
-                font-weight: bold;
-            }
-            AnimatedButton:hover {
-                background: #FEF2F2;
-            }
-        """)
+        btn_close.setObjectName("erpWinCloseBtn")
         btn_close.clicked.connect(self.close)
         
         control_layout.addWidget(btn_minimize)
@@ -483,18 +409,13 @@ class ERPMainWindow(QMainWindow):
 
         # Área de contenido
         content_frame = QFrame()
-        content_frame.setStyleSheet("background: transparent;")
+        content_frame.setObjectName("erpContent")
         content_layout = QVBoxLayout(content_frame)
         content_layout.setContentsMargins(24, 24, 24, 24)
         content_layout.setSpacing(0)
 
         self.stack = QStackedWidget()
-        self.stack.setStyleSheet("""
-            QStackedWidget {
-                background: transparent;
-                border-radius: 12px;
-            }
-        """)
+        self.stack.setObjectName("erpStack")
         content_layout.addWidget(self.stack)
 
         main_area_layout.addWidget(content_frame)
@@ -502,117 +423,104 @@ class ERPMainWindow(QMainWindow):
 
         # Registrar frames
         self.frames = {}
-        self.frame_titles = {
-            "Dashboard": "Panel Principal",
-            "Ventas (POS)": "Sistema de Ventas POS",
-            "Clientes": "Gestión de Clientes",
-            "Productos": "Inventario de Productos",
-            "Proveedores": "Gestión de Proveedores",
-            "Configuración": "Configuración del Sistema",
-            "Notificaciones": "Centro de Notificaciones"
-        }
-
-        # Dashboard
-        if DashboardFrameCls:
-            try:
-                dashboard = DashboardFrameCls(self)
-            except TypeError:
-                try:
-                    dashboard = DashboardFrameCls(self, self)
-                except Exception as e:
-                    print("[WARN] Error instanciando Dashboard:", e)
-                    dashboard = PlaceholderFrame("Dashboard", "Error cargando el panel principal")
-            except Exception as e:
-                print("[WARN] Error instanciando Dashboard:", e)
-                dashboard = PlaceholderFrame("Dashboard", "Error cargando el panel principal")
-        else:
-            dashboard = PlaceholderFrame("Dashboard", "Módulo Dashboard en desarrollo")
-
-        self.add_frame("Dashboard", dashboard)
-
-        # Otros frames
-        def reg(name, cls):
-            if cls:
-                try:
-                    w = cls(self)
-                except TypeError:
-                    try:
-                        w = cls(self, self)
-                    except Exception as ex:
-                        print(f"[WARN] Error creando {name}: {ex}")
-                        w = PlaceholderFrame(name, f"Error inicializando {name}")
-                except Exception as ex:
-                    print(f"[WARN] Error creando {name}: {ex}")
-                    w = PlaceholderFrame(name, f"Error inicializando {name}")
-            else:
-                w = PlaceholderFrame(name, f"Módulo {name} en desarrollo")
-            self.add_frame(name, w)
-
-        reg("Productos", ProductFrameCls)
-        reg("Proveedores", SupplierFrameCls)
-        reg("Configuración", ConfigFrameCls)
-        reg("Clientes", ClientsFrameCls)
-        reg("Ventas (POS)", SalesFrameCls)
-
-        # Notificaciones
+
+        # Los frames se construyen en su primera visita (show_frame)
+        for name in _LAZY_FRAMES:
+            self.add_frame(name, lambda n=name: self._build_frame(n))
+        self.add_frame("Notificaciones", self._build_notif)
+        self._prewarm_queue = list(self._prewarm_order)
+
+        # Mostrar dashboard por defecto
+        self.show_frame("Dashboard", set_checked=False)
+
+    def event(self, e):
+        if e.type() == QEvent.Show and not self._login_shown:
+            # Tras el primer pintado, sin un retardo fijo
+            self._login_shown = True
+            QTimer.singleShot(0, self.show_login)
+        return super().event(e)
+
+    @property
+    def file_manager(self):
+        """FileManager creado en el primer acceso.
+
+        Ni file_manager ni tkinter se importan al arrancar; tkinter llega con
+        el primero que lo necesite, este FileManager o el frame de Ventas
+        (que _prewarm_next importa tras el login).
+        """
+        if self._file_manager is None:
+            from file_manager import FileManager
+            self._file_manager = FileManager(self.db)
+        return self._file_manager
+
+    def _build_frame(self, name):
+        """Importa y construye el frame de la pestaña name"""
+        cls = frame_class(name)
+        if not cls:
+            return PlaceholderFrame(name, f"Módulo {name} en desarrollo")
+        try:
+            # Los frames reciben la ventana como (parent) o como (parent, app)
+            return cls(*(self,) * _frame_arity(cls))
+        except Exception as ex:
+            print(f"[WARN] Error creando {name}: {ex}")
+            return PlaceholderFrame(name, f"Error inicializando {name}")
+
+    def _build_notif(self):
+        """Página de acceso al centro de notificaciones"""
         notif_widget = QWidget()
         notif_layout = QVBoxLayout(notif_widget)
         notif_layout.setAlignment(Qt.AlignCenter)
         
-        icon = QLabel("🔔")
-        icon.setFont(QFont("Segoe UI", 48))
+        icon = QLabel()
+        icon.setPixmap(_emoji_pixmap("🔔", 48))
         icon.setAlignment(Qt.AlignCenter)
         
         title = QLabel("Centro de Notificaciones")
-        title.setFont(QFont("Segoe UI", 20, QFont.Bold))
+        title.setFont(_font(20, QFont.Bold))
         title.setStyleSheet("color: #1E293B; margin: 20px 0;")
         title.setAlignment(Qt.AlignCenter)
         
         btn_open = AnimatedButton("Abrir Centro de Notificaciones")
         btn_open.setMinimumHeight(44)
-        btn_open.setStyleSheet("""
-            AnimatedButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #3B82F6, stop:1 #60A5FA);
-                border: none;
-                border-radius: 8px;
-                color: white;
-                font-weight: 600;
-                font-size: 14px;
-                padding: 0 24px;
-            }
-            AnimatedButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #2563EB, stop:1 #3B82F6);
-            }
-        """)
+        btn_open.setObjectName("erpNotifOpenBtn")
         btn_open.clicked.connect(self.notification_manager.show_notification_center)
         
         notif_layout.addWidget(icon)
         notif_layout.addWidget(title)
         notif_layout.addWidget(btn_open, alignment=Qt.AlignCenter)
         notif_layout.addStretch()
-        
-        self.add_frame("Notificaciones", notif_widget)
-
-        # Mostrar dashboard por defecto
-        self.show_frame("Dashboard", set_checked=False)
-        
-        # Abrir login después de mostrar la ventana
-        QTimer.singleShot(200, self.show_login)
+        return notif_widget
+
+    def _prewarm_next(self):
+        """Importa el módulo del siguiente frame de _prewarm_order, uno por tick.
+
+        Solo importa: los widgets se siguen creando en el hilo de la
+        interfaz en su primera visita. Las pestañas ya importadas (por
+        ejemplo, visitadas antes de su turno) se saltan sin gastar un tick.
+        """
+        importados = vars(sys.modules[__name__])
+        while self._prewarm_queue and self._prewarm_queue[0] in importados:
+            self._prewarm_queue.pop(0)
+        if not self._prewarm_queue:
+            return
+        frame_class(self._prewarm_queue.pop(0))
+        if self._prewarm_queue:
+            QTimer.singleShot(50, self._prewarm_next)
 
-    def add_frame(self, name, widget):
-        idx = self.stack.addWidget(widget)
-        self.frames[name] = idx
+    def add_frame(self, name, factory):
+        """Registra la pestaña name; factory() crea su widget en la primera visita"""
+        self.frames[name] = {"widget_idx": None, "factory": factory}
 
     def show_frame(self, name, set_checked=True):
         if name in self.frames:
-            self.stack.setCurrentIndex(self.frames[name])
-            self.header_title.setText(self.frame_titles.get(name, name))
+            entry = self.frames[name]
+            if entry["widget_idx"] is None:
+                entry["widget_idx"] = self.stack.addWidget(entry["factory"]())
+            self.stack.setCurrentIndex(entry["widget_idx"])
+            self.header_title.setText(self.FRAME_TITLES.get(name, name))
             
-            if set_checked:
-                for btn_name, btn in self.sidebar.btns.items():
-                    btn.setChecked(btn_name == name)
+            if set_checked and name in self.sidebar.btns:
+                self.sidebar.btns[name].setChecked(True)
         else:
             print("[WARN] Frame no registrado:", name)
 
@@ -636,7 +544,9 @@ class ERPMainWindow(QMainWindow):
             except Exception as e:
                 print("[WARN] notify_login falló:", e)
                 
+            self.notification_manager.stock_check_timer.start()
             self.show_frame("Dashboard")
+            QTimer.singleShot(500, self._prewarm_next)
         else:
             self.show_frame("Dashboard")
 
@@ -648,6 +558,7 @@ class ERPMainWindow(QMainWindow):
         
         if reply == QMessageBox.Yes:
             self.current_user = None
+            self.notification_manager.stock_check_timer.stop()
             self.sidebar.lbl_user.setText("No autenticado")
             self.sidebar.lbl_role.setText("Inicia sesión para continuar")
             
@@ -678,29 +589,30 @@ class ERPMainWindow(QMainWindow):
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    # Agrupar eventos de alta frecuencia (movimiento de ratón, tableta)
+    QApplication.setAttribute(Qt.AA_CompressHighFrequencyEvents, True)
+    QApplication.setAttribute(Qt.AA_CompressTabletEvents, True)
     app = QApplication(sys.argv)
+    # Sin animaciones globales de menús y combos
+    app.setEffectEnabled(Qt.UI_AnimateMenu, False)
+    app.setEffectEnabled(Qt.UI_FadeMenu, False)
+    app.setEffectEnabled(Qt.UI_AnimateCombo, False)
+    QPixmapCache.setCacheLimit(2048)
     
     # Establecer estilo general de la aplicación
-    app.setStyle("Fusion")
+    app.setStyle(ERPStyle("Fusion"))
+    # Una sola hoja para toda la aplicación; los controles se seleccionan por objectName
+    app.setStyleSheet(APP_QSS)
     
     # Configurar paleta de colores
-    palette = QPalette()
-    palette.setColor(QPalette.Window, QColor(248, 250, 252))
-    palette.setColor(QPalette.WindowText, QColor(30, 41, 59))
-    palette.setColor(QPalette.Base, QColor(255, 255, 255))
-    palette.setColor(QPalette.AlternateBase, QColor(248, 250, 252))
-    palette.setColor(QPalette.ToolTipBase, QColor(255, 255, 255))
-    palette.setColor(QPalette.ToolTipText, QColor(30, 41, 59))
-    palette.setColor(QPalette.Text, QColor(30, 41, 59))
-    palette.setColor(QPalette.Button, QColor(248, 250, 252))
-    palette.setColor(QPalette.ButtonText, QColor(30, 41, 59))
-    palette.setColor(QPalette.BrightText, QColor(255, 255, 255))
-    palette.setColor(QPalette.Highlight, QColor(59, 130, 246))
-    palette.setColor(QPalette.HighlightedText, QColor(255, 255, 255))
+    palette = app.palette()
+    for role, rgb in _PALETTE_COLORS:
+        palette.setColor(role, QColor(*rgb))
     app.setPalette(palette)
     
     # Establecer fuente global
-    app.setFont(QFont("Segoe UI", 10))
+    app.setFont(_font(10))
     
     w = ERPMainWindow()
     w.show()